@@ -8,6 +8,7 @@ import time
 import uuid
 
 from fastapi import FastAPI, HTTPException, Request, Response, Depends
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -74,6 +75,11 @@ async def lifespan(app: FastAPI):
     app.state.fastrtc = get_fastrtc_service(llm_agent=app.state.agent)
     logger.info("fastrtc_service_initialized")
     
+    # Create request metric series for every route before traffic arrives
+    metrics.prewarm_endpoints(
+        (route.path, route.methods) for route in app.routes if isinstance(route, APIRoute)
+    )
+    
     logger.info("application_ready")
     
     yield
@@ -135,9 +141,10 @@ async def track_requests(request: Request, call_next):
         response = await call_next(request)
         duration = time.time() - start_time
         
-        # Track metrics
+        # Track metrics by route pattern so path parameters don't mint new series
+        route = request.scope.get("route")
         metrics.track_request(
-            endpoint=request.url.path,
+            endpoint=route.path if route else request.url.path,
             method=request.method,
             status=response.status_code,
             duration=duration
@@ -165,8 +172,9 @@ async def track_requests(request: Request, call_next):
             duration_seconds=duration
         )
         
+        route = request.scope.get("route")
         metrics.track_request(
-            endpoint=request.url.path,
+            endpoint=route.path if route else request.url.path,
             method=request.method,
             status=500,
             duration=duration
@@ -313,19 +321,23 @@ async def switch_llm_provider(request: SwitchProviderRequest):
             "message": f"Switched to {new_agent.provider_name}:{new_agent.model_name}"
         }
         
+    except ImportError as e:
+        # Provider SDK missing - a client error, as before lazy loading
+        logger.warning("llm_switch_unavailable", provider=request.provider, error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("llm_switch_failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/v1/llm/health")
-async def check_llm_health():
-    """Check health of current LLM provider."""
+async def check_llm_health(deep: bool = False):
+    """Check health of current LLM provider (deep=true runs a real generation)."""
     if not hasattr(app.state, 'agent'):
         raise HTTPException(status_code=500, detail="Agent not initialized")
     
     try:
-        health = app.state.agent.llm.health_check()
+        health = app.state.agent.llm.health_check(deep=deep)
         return health
     except Exception as e:
         return {
@@ -524,11 +536,11 @@ async def general_exception_handler(request: Request, exc: Exception):
         path=request.url.path
     )
     
-    metrics.errors.labels(
+    metrics.track_error(
         error_type=type(exc).__name__,
         component="api",
         severity="high"
-    ).inc()
+    )
     
     return JSONResponse(
         status_code=500,
@@ -639,7 +651,7 @@ async def health_liveness():
     Used by Kubernetes/Docker for liveness checks.
     """
     health_checker = get_health_checker()
-    result = health_checker.check_liveness()
+    result = health_checker.check_liveness(include_timestamp=True)
     
     logger.debug("liveness_check", status=result["status"])
     return result
@@ -661,7 +673,8 @@ async def health_readiness():
         llm_client=app.state.agent.llm,
         cache=app.state.agent.cache,
         memory=app.state.agent.memory,
-        rag=app.state.agent.rag
+        rag=app.state.agent.rag,
+        include_timestamp=True
     )
     
     logger.debug("readiness_check", 
@@ -688,14 +701,15 @@ async def health_full():
     health_checker = get_health_checker()
     
     # Liveness
-    liveness = health_checker.check_liveness()
+    liveness = health_checker.check_liveness(include_timestamp=True)
     
     # Readiness
     readiness = health_checker.check_readiness(
         llm_client=app.state.agent.llm,
         cache=app.state.agent.cache,
         memory=app.state.agent.memory,
-        rag=app.state.agent.rag
+        rag=app.state.agent.rag,
+        include_timestamp=True
     )
     
     # Component stats
@@ -46,13 +46,17 @@ class DatabaseManager:
                 echo=False  # Set to True for SQL debugging
             )
             
-            # Enable WAL mode for better concurrency
+            # Enable WAL mode for better concurrency: readers don't block
+            # behind writers and commits skip the per-transaction fsync
             @event.listens_for(self.engine, "connect")
             def set_sqlite_pragma(dbapi_conn, connection_record):
                 cursor = dbapi_conn.cursor()
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.execute("PRAGMA synchronous=NORMAL")
-                cursor.execute("PRAGMA cache_size=10000")
+                cursor.execute("PRAGMA wal_autocheckpoint=1000")
+                cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+                cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+                cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
                 cursor.execute("PRAGMA temp_store=MEMORY")
                 cursor.close()
         else:
@@ -86,6 +90,10 @@ class DatabaseManager:
         """Create all tables if they don't exist"""
         try:
             Base.metadata.create_all(bind=self.engine)
+            # create_all skips existing tables, so add indexes introduced later
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=self.engine, checkfirst=True)
             logger.info("database_tables_created")
         except Exception as e:
             logger.error("failed_to_create_tables", error=str(e))
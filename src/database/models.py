@@ -34,6 +34,7 @@ class Conversation(Base):
     # Indexes for performance
     __table_args__ = (
         Index('idx_conversation_created', 'conversation_id', 'created_at'),
+        Index('idx_conversation_message', 'conversation_id', 'message_index'),
         Index('idx_user_conversations', 'user_id', 'created_at'),
     )
     
@@ -33,11 +33,9 @@ class AsyncGuardrailsEngine:
             return {"status": "disabled", "passed": True}
         
         try:
-            # Run blocking guardrails in executor (background thread)
-            result = await asyncio.to_thread(
-                self.engine.check_input,
-                text
-            )
+            # PII is batched on a worker thread; the regex checks run on
+            # another thread (asyncio.to_thread) while it is in flight
+            result = await self.engine.check_input_async(text)
             
             # Check if all passed
             all_passed = all(check.passed for check in result.values())
@@ -47,7 +45,7 @@ class AsyncGuardrailsEngine:
                 violations = [
                     {
                         "check": check_name,
-                        "violations": check.violations
+                        "violations": [dict(v) for v in check.violations]
                     }
                     for check_name, check in result.items()
                     if not check.passed
@@ -94,7 +92,7 @@ class AsyncGuardrailsEngine:
                 logger.warning(
                     "output_guardrails_violations",
                     violations=[
-                        check.violations
+                        [dict(v) for v in check.violations]
                         for check in result.values()
                         if not check.passed
                     ]
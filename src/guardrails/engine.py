@@ -2,21 +2,42 @@
 AI Guardrails for safety, security, and quality control.
 Implements PII detection, toxicity filtering, prompt injection prevention.
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from collections import OrderedDict
 from enum import Enum
+from types import MappingProxyType
+import asyncio
 import re
+import threading
 import structlog
 
 # Optional presidio imports - only needed if PII detection is enabled
 try:
-    from presidio_analyzer import AnalyzerEngine
+    from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine
     from presidio_anonymizer import AnonymizerEngine
     PRESIDIO_AVAILABLE = True
 except ImportError:
     PRESIDIO_AVAILABLE = False
     AnalyzerEngine = None
+    BatchAnalyzerEngine = None
     AnonymizerEngine = None
 
+# Optional hyperscan import - vectorized multi-pattern matching, falls back to re
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    hyperscan = None
+
+# Optional Aho-Corasick automaton for literal keyword lists, falls back to regex
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
 from src.config.settings import settings
 from src.observability.metrics import metrics
 
@@ -31,20 +52,268 @@ class ViolationSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Patterns that are just a word-bounded keyword list, e.g. \b(hate|kill)\b
+_KEYWORD_LIST = re.compile(r'^\\b\(([\w ]+(?:\|[\w ]+)*)\)\\b$')
+
+
+# Two-level compile cache (like re._compile): a tiny dict for the hot
+# patterns, an LRU behind it for everything else
+_HOT_CACHE_SIZE = 8
+_COLD_CACHE_SIZE = 128
+_hot: Dict[Tuple[str, int], re.Pattern] = {}
+_cold: OrderedDict = OrderedDict()
+_compile_lock = threading.Lock()
+
+
+def _compile(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Compile a pattern through the hot/cold cache.
+    
+    Args:
+        pattern: Regex source
+        flags: re flags
+        
+    Returns:
+        Compiled pattern
+    """
+    key = (pattern, flags)
+    try:
+        return _hot[key]
+    except KeyError:
+        pass
+    
+    with _compile_lock:
+        compiled = _cold.get(key)
+        if compiled is None:
+            compiled = re.compile(pattern, flags)
+            _cold[key] = compiled
+            if len(_cold) > _COLD_CACHE_SIZE:
+                _cold.popitem(last=False)
+        else:
+            _cold.move_to_end(key)
+        
+        # Promote to the hot cache, dropping its oldest entry when full
+        if len(_hot) >= _HOT_CACHE_SIZE:
+            del _hot[next(iter(_hot))]
+        _hot[key] = compiled
+    return compiled
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex definition of a \\w character."""
+    return char.isalnum() or char == "_"
+
+
+def _fuse(patterns: List[Tuple[int, str]]) -> Tuple[re.Pattern, Dict[str, int]]:
+    """Fuse (pattern_id, pattern) pairs into one alternation of named groups."""
+    combined = _compile(
+        "|".join(f"(?P<p{pid}>{p})" for pid, p in patterns),
+        re.IGNORECASE
+    )
+    return combined, {f"p{pid}": pid for pid, _ in patterns}
+
+
+class _PatternScanner:
+    """
+    Case-insensitive multi-pattern matcher.
+    
+    Keyword-list patterns go into an Aho-Corasick automaton when available;
+    the rest use a Hyperscan database when available, otherwise a single
+    fused regex alternation, so the text is scanned once per backend.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._automaton = None
+        self._db = None
+        self._regex = None
+        self._full_regex = None
+        
+        keyword_ids = set()
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for pid, pattern in enumerate(self.patterns):
+                match = _KEYWORD_LIST.match(pattern)
+                if not match:
+                    continue
+                for word in match.group(1).split("|"):
+                    automaton.add_word(word.lower(), (pid, len(word)))
+                keyword_ids.add(pid)
+            if keyword_ids:
+                automaton.make_automaton()
+                self._automaton = automaton
+        
+        remaining = [(pid, p) for pid, p in enumerate(self.patterns) if pid not in keyword_ids]
+        if not remaining:
+            return
+        
+        if HYPERSCAN_AVAILABLE:
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[p.encode() for _, p in remaining],
+                    ids=[pid for pid, _ in remaining],
+                    elements=len(remaining),
+                    flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8
+                )
+                self._db = db
+                self._local = threading.local()  # Scratch space is per-thread
+            except Exception as e:
+                logger.warning("hyperscan_compile_failed", error=str(e))
+        
+        if self._db is None:
+            self._regex, self._index = _fuse(remaining)
+    
+    def scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find all pattern matches in text.
+        
+        Returns:
+            List of (pattern_id, start, end) with character offsets
+        """
+        hits: List[Tuple[int, int, int]] = []
+        
+        if self._automaton is not None:
+            lowered = text.lower()
+            if len(lowered) != len(text):
+                # Case folding changed the length, offsets would drift
+                return self._scan_full_regex(text)
+            hits.extend(self._scan_keywords(lowered))
+        
+        if self._db is not None:
+            hits.extend(self._scan_hyperscan(text))
+        elif self._regex is not None:
+            hits.extend(
+                (self._index[m.lastgroup], m.start(), m.end())
+                for m in self._regex.finditer(text)
+            )
+        
+        return sorted(hits, key=lambda h: h[1])
+    
+    def _scan_keywords(self, lowered: str) -> List[Tuple[int, int, int]]:
+        """Aho-Corasick pass with \\b-style word boundary checks."""
+        hits = []
+        last = len(lowered) - 1
+        for end_index, (pid, length) in self._automaton.iter(lowered):
+            start = end_index - length + 1
+            if start > 0 and _is_word_char(lowered[start - 1]):
+                continue
+            if end_index < last and _is_word_char(lowered[end_index + 1]):
+                continue
+            hits.append((pid, start, end_index + 1))
+        return hits
+    
+    def _scan_hyperscan(self, text: str) -> List[Tuple[int, int, int]]:
+        """Hyperscan pass, converting byte offsets to character offsets."""
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._db)
+        
+        data = text.encode()
+        hits: List[Tuple[int, int, int]] = []
+        self._db.scan(
+            data,
+            match_event_handler=lambda pid, start, end, flags, ctx: ctx.append((pid, start, end)),
+            context=hits,
+            scratch=scratch
+        )
+        
+        if not text.isascii():
+            hits = [
+                (pid, len(data[:start].decode()), len(data[:end].decode()))
+                for pid, start, end in hits
+            ]
+        return hits
+    
+    def _scan_full_regex(self, text: str) -> List[Tuple[int, int, int]]:
+        """Regex over every pattern; only used for the rare length-changing lowercase."""
+        if self._full_regex is None:
+            self._full_regex, self._full_index = _fuse(list(enumerate(self.patterns)))
+        return [
+            (self._full_index[m.lastgroup], m.start(), m.end())
+            for m in self._full_regex.finditer(text)
+        ]
+
+
 class GuardrailResult:
-    """Result from guardrail check."""
+    """
+    Result from guardrail check.
+    
+    Violation dicts can be built lazily: pass violations_builder and
+    violations_count instead of violations, and the dicts are only
+    materialized when .violations is first read.
+    """
     
     def __init__(
         self,
         passed: bool,
         violations: List[Dict[str, Any]] = None,
         sanitized_text: Optional[str] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        violations_builder: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        violations_count: int = 0
     ):
         self.passed = passed
-        self.violations = violations or []
+        self._builder = violations_builder
+        if violations_builder is None:
+            self.violations = violations or []
+        else:
+            self._violations = None
+            self.violations_count = violations_count
         self.sanitized_text = sanitized_text
         self.metadata = metadata or {}
+    
+    @property
+    def violations(self) -> List[Dict[str, Any]]:
+        if self._violations is None:
+            built = self._builder()
+            if getattr(self, "_frozen", False):
+                built = _freeze_violations(built)
+            # Cache bypasses the frozen check; the content is fixed either way
+            object.__setattr__(self, "_violations", built)
+        return self._violations
+    
+    @violations.setter
+    def violations(self, value: List[Dict[str, Any]]):
+        self._violations = value
+        self.violations_count = len(value)
+    
+    def __setattr__(self, name: str, value: Any):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"GuardrailResult is frozen, cannot set {name!r}")
+        super().__setattr__(name, value)
+    
+    def freeze(self) -> "GuardrailResult":
+        """Make the result immutable so it can be shared (e.g. from a cache)."""
+        if self._violations is not None:
+            self.violations = _freeze_violations(self._violations)
+        self.metadata = MappingProxyType(dict(self.metadata))
+        self._frozen = True
+        return self
+
+
+def _freeze_violations(violations: List[Dict[str, Any]]) -> Tuple[MappingProxyType, ...]:
+    """Read-only copy of violation dicts, safe to share between callers."""
+    return tuple(MappingProxyType(dict(v)) for v in violations)
+
+
+# Shared results for the common pass case (frozen, so safe to hand out)
+_PASS_RESULT = GuardrailResult(passed=True).freeze()
+_TOXICITY_PASS = GuardrailResult(passed=True, metadata={"check_type": "toxicity"}).freeze()
+_INJECTION_PASS = GuardrailResult(passed=True, metadata={"check_type": "prompt_injection"}).freeze()
+
+
+# Entities whose recognizers cannot match without a digit or "@" in the text
+_MARKER_ENTITIES = frozenset({
+    "EMAIL_ADDRESS",
+    "PHONE_NUMBER",
+    "CREDIT_CARD",
+    "IBAN_CODE",
+    "IP_ADDRESS",
+    "US_SSN",
+    "US_DRIVER_LICENSE",
+    "US_PASSPORT"
+})
 
 
 class PIIGuardrail:
@@ -53,14 +322,22 @@ class PIIGuardrail:
     Uses Microsoft Presidio for enterprise-grade PII detection.
     """
     
+    # Micro-batching limits for check_async
+    max_batch_size = 16
+    max_batch_wait = 0.003  # seconds
+    
+    # Results cached per (text, language)
+    cache_size = 2048
+    
     def __init__(self):
         if not PRESIDIO_AVAILABLE:
             raise ImportError("presidio_analyzer and presidio_anonymizer are required for PII detection")
         self.analyzer = AnalyzerEngine()
-        self.anonymizer = AnonymizerEngine()
+        # Only needed for advanced operators (hash, encrypt, ...)
+        self.anonymizer = AnonymizerEngine() if settings.pii_use_anonymizer else None
         
-        # PII entities to detect
-        self.entities = [
+        # PII entities to detect (immutable, passed to Presidio as-is)
+        self.entities: Tuple[str, ...] = (
             "PERSON",
             "EMAIL_ADDRESS",
             "PHONE_NUMBER",
@@ -72,7 +349,21 @@ class PIIGuardrail:
             "US_SSN",
             "US_DRIVER_LICENSE",
             "US_PASSPORT"
-        ]
+        )
+        
+        # Fast reject: strip digits and "@"; unchanged length means no markers
+        self._marker_table = str.maketrans("", "", "0123456789@")
+        self._markerless_entities = tuple(e for e in self.entities if e not in _MARKER_ENTITIES)
+        
+        # LRU of frozen results shared by check and check_async
+        self._result_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Micro-batching state for check_async (created on first use per event loop)
+        self.batch_analyzer = BatchAnalyzerEngine(analyzer_engine=self.analyzer)
+        self._batch_loop = None
+        self._batch_queue = None
+        self._batch_task = None
         
         logger.info("pii_guardrail_initialized", entities=self.entities)
     
@@ -87,59 +378,216 @@ class PIIGuardrail:
         Returns:
             GuardrailResult with violations and sanitized text
         """
+        result = self._cache_get(text, language)
+        if result is None:
+            try:
+                results = self._analyze(text, language)
+                result = self._build_result(text, results, language)
+            except Exception as e:
+                logger.error("pii_check_failed", error=str(e))
+                return _PASS_RESULT  # Fail open
+            self._cache_put(text, language, result)
+        
+        self._record(result)
+        return result
+    
+    async def check_async(self, text: str, language: str = "en") -> GuardrailResult:
+        """
+        Detect PII without blocking the event loop.
+        
+        Requests are queued and analyzed in micro-batches on a worker
+        thread, so concurrent conversations share one spaCy pipeline pass.
+        """
+        result = self._cache_get(text, language)
+        if result is not None:
+            self._record(result)
+            return result
+        
         try:
-            # Analyze for PII
-            results = self.analyzer.analyze(
-                text=text,
-                entities=self.entities,
-                language=language
-            )
+            loop = asyncio.get_running_loop()
+            if self._batch_loop is not loop:
+                # Queues and tasks are bound to the loop that created them
+                self._batch_loop = loop
+                self._batch_queue = asyncio.Queue()
+                self._batch_task = loop.create_task(self._batch_worker())
+            
+            future = loop.create_future()
+            self._batch_queue.put_nowait((text, language, future))
+            result = await future
+        except Exception as e:
+            logger.error("pii_check_failed", error=str(e))
+            return _PASS_RESULT  # Fail open
+        
+        self._cache_put(text, language, result)
+        self._record(result)
+        return result
+    
+    def _cache_get(self, text: str, language: str) -> Optional[GuardrailResult]:
+        """Look up a cached result, refreshing its recency."""
+        key = (text, language)
+        with self._cache_lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+            return result
+    
+    def _cache_put(self, text: str, language: str, result: GuardrailResult):
+        """Store a frozen result, evicting the least recently used."""
+        with self._cache_lock:
+            self._result_cache[(text, language)] = result
+            self._result_cache.move_to_end((text, language))
+            while len(self._result_cache) > self.cache_size:
+                self._result_cache.popitem(last=False)
+    
+    async def _batch_worker(self):
+        """Drain the queue into batches of up to max_batch_size or max_batch_wait."""
+        loop = asyncio.get_running_loop()
+        queue = self._batch_queue
+        
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_batch_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
             
-            violations = []
-            for result in results:
-                violations.append({
+            try:
+                batch_results = await asyncio.to_thread(
+                    self._check_batch,
+                    [(text, language) for text, language, _ in batch]
+                )
+                for (_, _, future), results in zip(batch, batch_results):
+                    if not future.done():
+                        future.set_result(results)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    def has_markers(self, text: str) -> bool:
+        """True if the text has a digit or "@", which structured PII needs."""
+        return len(text.translate(self._marker_table)) != len(text)
+    
+    def _select_entities(self, text: str) -> Tuple[str, ...]:
+        """Skip structured recognizers when the text has no digit or "@"."""
+        if self.has_markers(text):
+            return self.entities
+        return self._markerless_entities
+    
+    def _analyze(self, text: str, language: str) -> List[Any]:
+        """Run the Presidio analyzer on a single text."""
+        entities = self._select_entities(text)
+        if not entities:
+            return []
+        return self.analyzer.analyze(
+            text=text,
+            entities=entities,
+            language=language
+        )
+    
+    def _analyze_batch(self, items: List[Tuple[str, str]]) -> List[List[Any]]:
+        """
+        Analyze many texts, grouping by (language, entities) so each group
+        goes through spaCy's nlp.pipe in one call.
+        """
+        results: List[List[Any]] = [[] for _ in items]
+        groups: Dict[Tuple[str, Tuple[str, ...]], List[int]] = {}
+        for i, (text, language) in enumerate(items):
+            entities = self._select_entities(text)
+            if entities:
+                groups.setdefault((language, entities), []).append(i)
+        
+        for (language, entities), indices in groups.items():
+            group_results = self.batch_analyzer.analyze_iterator(
+                texts=[items[i][0] for i in indices],
+                language=language,
+                entities=entities
+            )
+            for i, result in zip(indices, group_results):
+                results[i] = result
+        
+        return results
+    
+    def _check_batch(self, items: List[Tuple[str, str]]) -> List[GuardrailResult]:
+        """Analyze and redact a batch (runs on the worker thread, off the event loop)."""
+        return [
+            self._build_result(text, results, language)
+            for (text, language), results in zip(items, self._analyze_batch(items))
+        ]
+    
+    def _build_result(self, text: str, results: List[Any], language: str) -> GuardrailResult:
+        """Turn analyzer results into a frozen GuardrailResult."""
+        def build_violations() -> List[Dict[str, Any]]:
+            return [
+                {
                     "type": result.entity_type,
                     "start": result.start,
                     "end": result.end,
                     "score": result.score,
                     "text": text[result.start:result.end]
-                })
-            
-            # Anonymize if violations found
-            sanitized_text = None
-            if violations:
+                }
+                for result in results
+            ]
+        
+        # Anonymize if violations found
+        sanitized_text = None
+        if results:
+            if self.anonymizer is not None:
                 anonymized = self.anonymizer.anonymize(
                     text=text,
                     analyzer_results=results
                 )
                 sanitized_text = anonymized.text
-            
-            passed = len(violations) == 0
-            
-            # Track metrics
-            metrics.track_guardrail(
-                check_type="pii_detection",
-                result="pass" if passed else "fail",
-                violation=not passed,
-                severity="high" if violations else "low"
-            )
-            
-            logger.info(
-                "pii_check_completed",
-                violations_count=len(violations),
-                passed=passed
-            )
-            
-            return GuardrailResult(
-                passed=passed,
-                violations=violations,
-                sanitized_text=sanitized_text,
-                metadata={"check_type": "pii", "language": language}
-            )
-            
-        except Exception as e:
-            logger.error("pii_check_failed", error=str(e))
-            return GuardrailResult(passed=True)  # Fail open
+            else:
+                sanitized_text = self._redact(text, results)
+        
+        return GuardrailResult(
+            passed=len(results) == 0,
+            sanitized_text=sanitized_text,
+            metadata={"check_type": "pii", "language": language},
+            violations_builder=build_violations,
+            violations_count=len(results)
+        ).freeze()
+    
+    @staticmethod
+    def _redact(text: str, results: List[Any]) -> str:
+        """
+        Replace each detected span with <ENTITY_TYPE>.
+        
+        Overlapping spans are merged into the earlier replacement so no
+        part of a detected entity leaks through.
+        """
+        out = []
+        last = 0
+        for result in sorted(results, key=lambda r: (r.start, -r.end)):
+            if result.start < last:
+                last = max(last, result.end)
+                continue
+            out.append(text[last:result.start])
+            out.append(f"<{result.entity_type}>")
+            last = result.end
+        out.append(text[last:])
+        return "".join(out)
+    
+    def _record(self, result: GuardrailResult):
+        """Track metrics and log for every check, cached or not."""
+        metrics.track_guardrail(
+            check_type="pii_detection",
+            result="pass" if result.passed else "fail",
+            violation=not result.passed,
+            severity="high" if result.violations_count else "low"
+        )
+        
+        logger.info(
+            "pii_check_completed",
+            violations_count=result.violations_count,
+            passed=result.passed
+        )
 
 
 class ToxicityGuardrail:
@@ -156,6 +604,7 @@ class ToxicityGuardrail:
             r'\b(hate|kill|die|stupid|idiot|damn)\b',
             r'\b(racist|sexist|bigot)\b',
         ]
+        self._scanner = _PatternScanner(self.toxic_patterns)
         
         logger.info("toxicity_guardrail_initialized", threshold=threshold)
     
@@ -169,34 +618,50 @@ class ToxicityGuardrail:
         Returns:
             GuardrailResult
         """
-        violations = []
-        
-        # Check patterns
-        for pattern in self.toxic_patterns:
-            matches = re.finditer(pattern, text.lower())
-            for match in matches:
-                violations.append({
-                    "type": "toxicity",
-                    "pattern": pattern,
-                    "text": match.group(),
-                    "start": match.start(),
-                    "end": match.end()
-                })
+        # Single pass over the text for all patterns
+        return self.evaluate(text, self._scanner.scan(text))
+    
+    def evaluate(self, text: str, hits: List[Tuple[int, int, int]]) -> GuardrailResult:
+        """
+        Build the result from (pattern_id, start, end) hits of a scan.
         
-        passed = len(violations) == 0
+        Args:
+            text: Scanned text
+            hits: Matches indexed into toxic_patterns
+            
+        Returns:
+            GuardrailResult
+        """
+        passed = len(hits) == 0
         
         # Track metrics
         metrics.track_guardrail(
             check_type="toxicity",
             result="pass" if passed else "fail",
             violation=not passed,
-            severity="medium" if violations else "low"
+            severity="medium" if hits else "low"
         )
         
+        if passed:
+            return _TOXICITY_PASS
+        
+        def build_violations() -> List[Dict[str, Any]]:
+            return [
+                {
+                    "type": "toxicity",
+                    "pattern": self.toxic_patterns[pattern_id],
+                    "text": text[start:end].lower(),
+                    "start": start,
+                    "end": end
+                }
+                for pattern_id, start, end in hits
+            ]
+        
         return GuardrailResult(
             passed=passed,
-            violations=violations,
-            metadata={"check_type": "toxicity"}
+            metadata={"check_type": "toxicity"},
+            violations_builder=build_violations,
+            violations_count=len(hits)
         )
 
 
@@ -219,6 +684,7 @@ class PromptInjectionGuardrail:
             r'developer mode',
             r'jailbreak'
         ]
+        self._scanner = _PatternScanner(self.injection_patterns)
         
         logger.info("prompt_injection_guardrail_initialized")
     
@@ -232,31 +698,49 @@ class PromptInjectionGuardrail:
         Returns:
             GuardrailResult
         """
-        violations = []
-        text_lower = text.lower()
-        
-        for pattern in self.injection_patterns:
-            if re.search(pattern, text_lower):
-                violations.append({
-                    "type": "prompt_injection",
-                    "pattern": pattern,
-                    "risk": "high"
-                })
+        return self.evaluate(text, self._scanner.scan(text))
+    
+    def evaluate(self, text: str, hits: List[Tuple[int, int, int]]) -> GuardrailResult:
+        """
+        Build the result from (pattern_id, start, end) hits of a scan.
         
-        passed = len(violations) == 0
+        Args:
+            text: Scanned text
+            hits: Matches indexed into injection_patterns
+            
+        Returns:
+            GuardrailResult
+        """
+        # Report each matching pattern once, in order of first match
+        matched = list(dict.fromkeys(pattern_id for pattern_id, _, _ in hits))
+        passed = len(matched) == 0
         
         # Track metrics
         metrics.track_guardrail(
             check_type="prompt_injection",
             result="pass" if passed else "fail",
             violation=not passed,
-            severity="critical" if violations else "low"
+            severity="critical" if matched else "low"
         )
         
+        if passed:
+            return _INJECTION_PASS
+        
+        def build_violations() -> List[Dict[str, Any]]:
+            return [
+                {
+                    "type": "prompt_injection",
+                    "pattern": self.injection_patterns[pattern_id],
+                    "risk": "high"
+                }
+                for pattern_id in matched
+            ]
+        
         return GuardrailResult(
             passed=passed,
-            violations=violations,
-            metadata={"check_type": "prompt_injection"}
+            metadata={"check_type": "prompt_injection"},
+            violations_builder=build_violations,
+            violations_count=len(matched)
         )
 
 
@@ -270,32 +754,26 @@ class ContentLengthGuardrail:
     def check_input(self, text: str) -> GuardrailResult:
         """Check input length."""
         length = len(text)
-        passed = length <= self.max_input_length
-        
-        violations = []
-        if not passed:
-            violations.append({
-                "type": "input_length_exceeded",
-                "length": length,
-                "max": self.max_input_length
-            })
-        
-        return GuardrailResult(passed=passed, violations=violations)
+        if length <= self.max_input_length:
+            return _PASS_RESULT
+        
+        return GuardrailResult(passed=False, violations=[{
+            "type": "input_length_exceeded",
+            "length": length,
+            "max": self.max_input_length
+        }])
     
     def check_output(self, text: str) -> GuardrailResult:
         """Check output length."""
         length = len(text)
-        passed = length <= self.max_output_length
-        
-        violations = []
-        if not passed:
-            violations.append({
-                "type": "output_length_exceeded",
-                "length": length,
-                "max": self.max_output_length
-            })
-        
-        return GuardrailResult(passed=passed, violations=violations)
+        if length <= self.max_output_length:
+            return _PASS_RESULT
+        
+        return GuardrailResult(passed=False, violations=[{
+            "type": "output_length_exceeded",
+            "length": length,
+            "max": self.max_output_length
+        }])
 
 
 class GuardrailsEngine:
@@ -309,6 +787,13 @@ class GuardrailsEngine:
         self.injection_guardrail = PromptInjectionGuardrail()
         self.length_guardrail = ContentLengthGuardrail()
         
+        # One scanner over toxicity + injection patterns; injection ids are
+        # offset by the number of toxicity patterns
+        self._toxicity_pattern_count = len(self.toxicity_guardrail.toxic_patterns)
+        self._scanner = _PatternScanner(
+            self.toxicity_guardrail.toxic_patterns + self.injection_guardrail.injection_patterns
+        )
+        
         logger.info(
             "guardrails_engine_initialized",
             pii_enabled=self.pii_guardrail is not None,
@@ -328,22 +813,53 @@ class GuardrailsEngine:
         if not settings.guardrails_enabled:
             return {}
         
-        results = {}
-        
-        # Check input length
-        results["length"] = self.length_guardrail.check_input(text)
+        # Length, toxicity and prompt injection in one pass
+        results = self._scan_non_pii(text)
         
         # Check for PII
         if self.pii_guardrail:
             results["pii"] = self.pii_guardrail.check(text)
         
-        # Check for toxicity
-        results["toxicity"] = self.toxicity_guardrail.check(text)
+        # Log aggregate results
+        all_passed = all(r.passed for r in results.values())
+        logger.info(
+            "input_guardrails_completed",
+            all_passed=all_passed,
+            checks=list(results.keys())
+        )
         
-        # Check for prompt injection
-        results["injection"] = self.injection_guardrail.check(text)
+        return results
+    
+    async def check_input_async(self, text: str) -> Dict[str, GuardrailResult]:
+        """
+        Run all input guardrails without blocking the event loop.
+        
+        PII detection (the slow, NER-backed check) is queued first on the
+        batched worker; the regex checks then run on a worker thread while
+        it is in flight, so total latency is roughly that of the PII check
+        alone and neither blocks the event loop.
+        
+        Args:
+            text: User input to check
+            
+        Returns:
+            Dictionary of guardrail results
+        """
+        if not settings.guardrails_enabled:
+            return {}
+        
+        if self.pii_guardrail:
+            # Task order matters: the PII task runs first and enqueues its
+            # text before the regex scan is handed to a thread
+            pii_task = asyncio.ensure_future(self.pii_guardrail.check_async(text))
+            results, pii_result = await asyncio.gather(
+                asyncio.to_thread(self._scan_non_pii, text),
+                pii_task
+            )
+            results["pii"] = pii_result
+        else:
+            results = self._scan_non_pii(text)
         
-        # Log aggregate results
         all_passed = all(r.passed for r in results.values())
         logger.info(
             "input_guardrails_completed",
@@ -353,6 +869,37 @@ class GuardrailsEngine:
         
         return results
     
+    def _scan_non_pii(self, text: str, output: bool = False) -> Dict[str, GuardrailResult]:
+        """
+        Run the length, toxicity and (for input) injection checks from a
+        single scan of the text.
+        
+        Args:
+            text: Text to check
+            output: Apply output limits and skip the injection check
+            
+        Returns:
+            Dictionary of guardrail results
+        """
+        toxicity_hits = []
+        injection_hits = []
+        offset = self._toxicity_pattern_count
+        for pattern_id, start, end in self._scanner.scan(text):
+            if pattern_id < offset:
+                toxicity_hits.append((pattern_id, start, end))
+            else:
+                injection_hits.append((pattern_id - offset, start, end))
+        
+        results = {}
+        if output:
+            results["length"] = self.length_guardrail.check_output(text)
+        else:
+            results["length"] = self.length_guardrail.check_input(text)
+        results["toxicity"] = self.toxicity_guardrail.evaluate(text, toxicity_hits)
+        if not output:
+            results["injection"] = self.injection_guardrail.evaluate(text, injection_hits)
+        return results
+    
     def check_output(self, text: str) -> Dict[str, GuardrailResult]:
         """
         Run output guardrails.
@@ -366,18 +913,13 @@ class GuardrailsEngine:
         if not settings.guardrails_enabled:
             return {}
         
-        results = {}
-        
-        # Check output length
-        results["length"] = self.length_guardrail.check_output(text)
+        # Length and toxicity in one pass
+        results = self._scan_non_pii(text, output=True)
         
         # Check for PII in output
         if self.pii_guardrail:
             results["pii"] = self.pii_guardrail.check(text)
         
-        # Check for toxicity in output
-        results["toxicity"] = self.toxicity_guardrail.check(text)
-        
         all_passed = all(r.passed for r in results.values())
         logger.info(
             "output_guardrails_completed",
@@ -2,13 +2,24 @@
 Health Check Module
 Provides liveness and readiness probes for monitoring
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import asyncio
 import structlog
 import time
 from datetime import datetime
 
+import httpx
+
+from src.config.settings import settings
+from src.llm.base import LLMProvider
+
 logger = structlog.get_logger(__name__)
 
+# Keep-alive client for the readiness ping, so probes reuse one socket
+# instead of reconnecting every time
+_OLLAMA_TIMEOUT = 2.0
+_ollama = httpx.Client(base_url=settings.ollama_base_url, timeout=_OLLAMA_TIMEOUT)
+
 
 class HealthChecker:
     """
@@ -21,64 +32,135 @@ class HealthChecker:
     """
     
     def __init__(self):
-        self.start_time = datetime.now()
-        self.last_check_time = None
+        # Monotonic clock: cheap to read and unaffected by wall-clock jumps
+        self._start_ns = time.perf_counter_ns()
+        self.last_check_ns = None
+        self._ollama_async: Optional[httpx.AsyncClient] = None
         self.component_status: Dict[str, Dict[str, Any]] = {}
         logger.info("health_checker_initialized")
     
-    def check_liveness(self) -> Dict[str, Any]:
+    def check_liveness(self, include_timestamp: bool = False) -> Dict[str, Any]:
         """
         Liveness probe - is the application running?
         
+        Args:
+            include_timestamp: Add an ISO wall-clock timestamp to the response
+        
         Returns:
             Health status with uptime
         """
-        uptime_seconds = (datetime.now() - self.start_time).total_seconds()
+        uptime_seconds = (time.perf_counter_ns() - self._start_ns) / 1e9
         
-        return {
+        result = {
             "status": "alive",
-            "timestamp": datetime.now().isoformat(),
             "uptime_seconds": round(uptime_seconds, 2),
             "uptime_human": self._format_uptime(uptime_seconds)
         }
+        if include_timestamp:
+            result["timestamp"] = datetime.now().isoformat()
+        return result
     
     def check_readiness(
         self,
         llm_client=None,
         cache=None,
         memory=None,
-        rag=None
+        rag=None,
+        include_timestamp: bool = False
     ) -> Dict[str, Any]:
         """
         Readiness probe - is the application ready to serve requests?
         
         Checks all critical components.
         
+        Args:
+            include_timestamp: Add an ISO wall-clock timestamp to the response
+        
         Returns:
             Health status with component details
         """
         checks = {}
-        overall_ready = True
         
         # Check LLM
         if llm_client:
             try:
-                # Quick ping to Ollama
-                import requests
-                response = requests.get(
-                    "http://localhost:11434/api/tags",
-                    timeout=2
-                )
+                if isinstance(llm_client, LLMProvider):
+                    checks["llm"] = self._provider_status(llm_client)
+                else:
+                    # Quick ping to Ollama
+                    checks["llm"] = self._llm_status(_ollama.get("/api/tags"))
+            except Exception as e:
                 checks["llm"] = {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "response_time_ms": response.elapsed.total_seconds() * 1000
+                    "status": "unhealthy",
+                    "error": str(e)
                 }
+        
+        return self._complete_readiness(checks, cache, memory, rag, include_timestamp)
+    
+    async def check_readiness_async(
+        self,
+        llm_client=None,
+        cache=None,
+        memory=None,
+        rag=None,
+        include_timestamp: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Readiness probe for async endpoints; the Ollama ping does not block
+        the event loop.
+        
+        Returns:
+            Health status with component details
+        """
+        checks = {}
+        
+        if llm_client:
+            try:
+                if isinstance(llm_client, LLMProvider):
+                    checks["llm"] = await asyncio.to_thread(self._provider_status, llm_client)
+                else:
+                    if self._ollama_async is None:
+                        self._ollama_async = httpx.AsyncClient(
+                            base_url=settings.ollama_base_url,
+                            timeout=_OLLAMA_TIMEOUT
+                        )
+                    checks["llm"] = self._llm_status(await self._ollama_async.get("/api/tags"))
             except Exception as e:
                 checks["llm"] = {
                     "status": "unhealthy",
                     "error": str(e)
                 }
-                overall_ready = False
+        
+        return self._complete_readiness(checks, cache, memory, rag, include_timestamp)
+    
+    def _llm_status(self, response: httpx.Response) -> Dict[str, Any]:
+        """Turn the Ollama ping response into a component check"""
+        return {
+            "status": "healthy" if response.status_code == 200 else "unhealthy",
+            "response_time_ms": response.elapsed.total_seconds() * 1000
+        }
+    
+    def _provider_status(self, llm_client: LLMProvider) -> Dict[str, Any]:
+        """Shallow (ping-only) provider health as a component check"""
+        health = llm_client.health_check(deep=False)
+        check = {"status": health["status"]}
+        if "latency_ms" in health:
+            check["response_time_ms"] = health["latency_ms"]
+        if "error" in health:
+            check["error"] = health["error"]
+        return check
+    
+    def _complete_readiness(
+        self,
+        checks: Dict[str, Dict[str, Any]],
+        cache,
+        memory,
+        rag,
+        include_timestamp: bool
+    ) -> Dict[str, Any]:
+        """Run the in-process component checks and build the readiness result"""
+        # A failed ping (not just a non-200) means we are not ready
+        overall_ready = "error" not in checks.get("llm", {})
         
         # Check cache
         if cache:
@@ -127,21 +209,22 @@ class HealthChecker:
                 }
                 # RAG is optional, don't mark as not ready
         
-        self.last_check_time = datetime.now()
+        self.last_check_ns = time.perf_counter_ns()
         
-        return {
+        result = {
             "status": "ready" if overall_ready else "not_ready",
-            "timestamp": datetime.now().isoformat(),
             "checks": checks,
             "ready": overall_ready
         }
+        if include_timestamp:
+            result["timestamp"] = datetime.now().isoformat()
+        return result
     
     def _format_uptime(self, seconds: float) -> str:
         """Format uptime in human-readable format"""
-        days = int(seconds // 86400)
-        hours = int((seconds % 86400) // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        days, rem = divmod(int(seconds), 86400)
+        hours, rem = divmod(rem, 3600)
+        minutes, secs = divmod(rem, 60)
         
         parts = []
         if days > 0:
@@ -155,12 +238,9 @@ class HealthChecker:
         return " ".join(parts)
 
 
-# Global instance
-_health_checker = None
+# Global instance, created at import (the import lock makes this race-free)
+_health_checker = HealthChecker()
 
 def get_health_checker() -> HealthChecker:
-    """Get or create health checker singleton"""
-    global _health_checker
-    if _health_checker is None:
-        _health_checker = HealthChecker()
+    """Get the health checker singleton"""
     return _health_checker
@@ -6,11 +6,30 @@ Implement this interface to add new LLM backends.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, AsyncGenerator
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, List, Optional, AsyncGenerator, Tuple, Type
 from enum import Enum
+import asyncio
+import functools
+import hashlib
+import os
 import time
 
+import structlog
+
+# Optional tiktoken for accurate token counts, falls back to a chars/4 estimate
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    tiktoken = None
+
+from src.config.settings import settings
+from src.memory.cache import ResponseCache
+
+logger = structlog.get_logger(__name__)
+
 
 class LLMProviderType(Enum):
     """Supported LLM provider types"""
@@ -23,7 +42,7 @@ class LLMProviderType(Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Standardized response from any LLM provider"""
     text: str
@@ -40,12 +59,57 @@ class LLMResponse:
     finish_reason: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     
-    @property
-    def tokens_per_second(self) -> float:
-        """Calculate tokens per second"""
-        if self.latency_ms > 0:
-            return (self.output_tokens / self.latency_ms) * 1000
-        return 0.0
+    # Derived once from output_tokens / latency_ms
+    tokens_per_second: float = field(default=0.0, init=False)
+    
+    def __post_init__(self):
+        if self.latency_ms > 0 and self.output_tokens > 0:
+            self.tokens_per_second = self.output_tokens * 1000.0 / self.latency_ms
+
+
+@functools.lru_cache(maxsize=None)
+def _provider_cache() -> ResponseCache:
+    """
+    Response cache shared by all providers (created on first use).
+    
+    Kept apart from the agent's get_response_cache() so raw provider
+    responses don't evict user-facing answers or skew its hit rate.
+    """
+    return ResponseCache(
+        ttl_minutes=settings.llm_cache_ttl_minutes,
+        max_size=settings.llm_cache_max_size
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _env(name: str) -> Optional[str]:
+    """Read an environment variable once per process (see reset_provider)"""
+    return os.environ.get(name)
+
+
+@functools.lru_cache(maxsize=256)
+def _blake2_key(prompt: str) -> str:
+    """Prompt digest for cache keys (lookup and store reuse it; hot prompts skip re-encoding)"""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_encoder(name: str = "cl100k_base"):
+    """Load a tiktoken encoding once per process (None if unavailable)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        # e.g. the BPE file can't be downloaded on an offline host
+        logger.warning("tiktoken_encoding_unavailable", encoding=name, error=str(e))
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _count_tokens_cached(provider_cls: Type["LLMProvider"], model_name: str, text: str) -> int:
+    """Token counts are a pure function of (tokenizer, model, text), so memoize them"""
+    return provider_cls._count_tokens_uncached(model_name, text)
 
 
 class LLMProvider(ABC):
@@ -59,10 +123,18 @@ class LLMProvider(ABC):
     - generate_stream(): Streaming generation
     """
     
-    def __init__(self, model_name: str, **kwargs):
+    # Seconds a healthy health_check result is reused
+    health_ttl = 10.0
+    # Seconds ping() may take (readiness probes call it synchronously)
+    ping_timeout = 2.0
+    
+    def __init__(self, model_name: str, enable_cache: bool = True, **kwargs):
         self.model_name = model_name
+        self.enable_cache = enable_cache  # Response cache for generate_async
         self.config = kwargs
         self._initialized = False
+        self._name: Optional[str] = None
+        self._last_health: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
     
     @property
     @abstractmethod
@@ -73,7 +145,11 @@ class LLMProvider(ABC):
     @property
     def name(self) -> str:
         """Human-readable provider name"""
-        return f"{self.provider_type.value}:{self.model_name}"
+        # Built on first use: subclasses may finish setting up provider_type
+        # after calling super().__init__
+        if self._name is None:
+            self._name = f"{self.provider_type.value}:{self.model_name}"
+        return self._name
     
     @abstractmethod
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
@@ -103,6 +179,34 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def generate_many_async(
+        self,
+        prompts: List[str],
+        max_concurrency: int = 8,
+        **kwargs
+    ) -> List[LLMResponse]:
+        """
+        Generate responses for several prompts concurrently.
+        
+        Round-trips overlap instead of being awaited one after another;
+        a semaphore caps how many requests are in flight at once.
+        
+        Args:
+            prompts: Input prompts
+            max_concurrency: Maximum simultaneous requests
+            **kwargs: Provider-specific parameters (shared by all prompts)
+            
+        Returns:
+            LLMResponses in the same order as prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(prompt: str) -> LLMResponse:
+            async with semaphore:
+                return await self.generate_async(prompt, **kwargs)
+        
+        return await asyncio.gather(*(_one(p) for p in prompts))
+    
     async def generate_stream(
         self, 
         prompt: str, 
@@ -125,25 +229,66 @@ class LLMProvider(ABC):
         response = await self.generate_async(prompt, **kwargs)
         yield response.text
     
-    def health_check(self) -> Dict[str, Any]:
+    def ping(self) -> None:
+        """
+        Cheap reachability check; raises if the provider can't be reached.
+        
+        Override with the provider's lightest endpoint (model listing,
+        /api/tags, ...), bounded by ping_timeout with no retries. The
+        default falls back to a one-token generation.
+        """
+        self.generate("Hi", max_tokens=1)
+    
+    def health_check(self, deep: bool = False) -> Dict[str, Any]:
         """
         Check if the provider is healthy and accessible.
         
+        Healthy results are reused for health_ttl seconds so frequent polling
+        doesn't hit the backend; unhealthy results are never cached, so
+        recovery shows up on the next call.
+        
+        Args:
+            deep: Run a real generation instead of the cheap ping
+        
+        Returns:
+            Dict with status and details
+        """
+        cached = self._last_health.get(deep)
+        if cached is not None and time.monotonic() - cached[0] < self.health_ttl:
+            return cached[1]
+        
+        result = self._check_health(deep)
+        if result.get("status") == "healthy":
+            self._last_health[deep] = (time.monotonic(), result)
+        return result
+    
+    def _check_health(self, deep: bool) -> Dict[str, Any]:
+        """
+        Probe the provider (uncached). Override per provider.
+        
+        Args:
+            deep: Run a real generation instead of the cheap ping
+        
         Returns:
             Dict with status and details
         """
         try:
             start = time.time()
-            response = self.generate("Say 'OK' if you're working.", max_tokens=10)
+            if deep:
+                response = self.generate("Say 'OK' if you're working.", max_tokens=10)
+            else:
+                self.ping()
             latency = (time.time() - start) * 1000
             
-            return {
+            result = {
                 "status": "healthy",
                 "provider": self.provider_type.value,
                 "model": self.model_name,
-                "latency_ms": round(latency, 2),
-                "message": response.text[:50]
+                "latency_ms": round(latency, 2)
             }
+            if deep:
+                result["message"] = response.text[:50]
+            return result
         except Exception as e:
             return {
                 "status": "unhealthy",
@@ -154,17 +299,115 @@ class LLMProvider(ABC):
     
     def count_tokens(self, text: str) -> int:
         """
-        Estimate token count for text.
-        Override for accurate counting per provider.
+        Estimate token count for text (cached per model and text).
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Estimated token count
+        """
+        return _count_tokens_cached(type(self), self.model_name, text)
+    
+    @classmethod
+    def _count_tokens_uncached(cls, model_name: str, text: str) -> int:
+        """
+        Count tokens without caching.
+        Override for accurate counting per provider; must depend only on
+        model_name and text so the result can be cached.
         
         Args:
+            model_name: Model whose tokenizer to use
             text: Input text
             
         Returns:
             Estimated token count
         """
-        # Default: ~4 characters per token (rough estimate)
+        encoder = _get_encoder()
+        if encoder is not None:
+            return len(encoder.encode_ordinary(text))
+        
+        # Fallback: ~4 characters per token (rough estimate)
         return len(text) // 4
     
+    def _build_response(
+        self,
+        text: str,
+        latency_ms: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        finish_reason: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        total_tokens: Optional[int] = None
+    ) -> LLMResponse:
+        """
+        Assemble an LLMResponse for this provider.
+        
+        Args:
+            text: Generated text
+            latency_ms: Request latency in milliseconds
+            input_tokens: Prompt tokens
+            output_tokens: Completion tokens
+            finish_reason: Why generation stopped
+            metadata: Provider-specific extras
+            total_tokens: Reported total (defaults to input + output)
+            
+        Returns:
+            LLMResponse
+        """
+        if total_tokens is None:
+            total_tokens = input_tokens + output_tokens
+        return LLMResponse(
+            text, self.provider_type.value, self.model_name, latency_ms,
+            input_tokens, output_tokens, total_tokens, finish_reason,
+            {} if metadata is None else metadata
+        )
+    
+    def _cache_context(self, prompt: str, kwargs: Dict[str, Any]) -> tuple:
+        """Cache key parts: prompt digest plus everything that shapes the output"""
+        digest = _blake2_key(prompt)
+        max_tokens = kwargs.get("max_tokens")
+        if max_tokens is None:
+            for attr in ("max_tokens", "max_output_tokens", "num_predict"):
+                max_tokens = getattr(self, attr, None)
+                if max_tokens is not None:
+                    break
+        return digest, {
+            "provider": self.provider_type.value,
+            "model": self.model_name,
+            "temperature": kwargs.get("temperature", getattr(self, "temperature", None)),
+            "max_tokens": max_tokens,
+            "params": sorted(
+                (k, repr(v)) for k, v in kwargs.items()
+                if k not in ("temperature", "max_tokens")
+            )
+        }
+    
+    def _cache_lookup(self, prompt: str, kwargs: Dict[str, Any]) -> Optional[LLMResponse]:
+        """
+        Return a cached response for this prompt and parameters, if any.
+        
+        Args:
+            prompt: The input prompt
+            kwargs: Generation parameters passed to generate_async
+            
+        Returns:
+            Cached LLMResponse (marked cached in metadata) or None
+        """
+        if not self.enable_cache:
+            return None
+        digest, context = self._cache_context(prompt, kwargs)
+        hit = _provider_cache().get(digest, context)
+        if hit is None:
+            return None
+        return replace(hit, metadata={**hit.metadata, "cached": True})
+    
+    def _cache_store(self, prompt: str, kwargs: Dict[str, Any], response: LLMResponse):
+        """Cache a successful response (entries expire with the cache TTL)"""
+        if not self.enable_cache:
+            return
+        digest, context = self._cache_context(prompt, kwargs)
+        _provider_cache().set(digest, response, context)
+    
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} model={self.model_name}>"
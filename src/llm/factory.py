@@ -20,56 +20,84 @@ Usage:
     print(response.text)
 """
 
-import os
-from typing import Optional, Dict, Any, List
+import importlib
+import importlib.util
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 
-from src.llm.base import LLMProvider, LLMProviderType
+from src.llm.base import LLMProvider, LLMProviderType, _env
 from src.config.settings import settings
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
-# Provider registry
-_providers: Dict[str, type] = {}
+# Provider registry: built-in providers are imported on first use, so
+# importing the factory doesn't pull in langchain / SDKs for unused backends
+_PROVIDER_PATHS: Dict[str, Tuple[str, str]] = {
+    "ollama": ("src.llm.ollama_provider", "OllamaProvider"),
+    "gemini": ("src.llm.gemini_provider", "GeminiProvider"),
+    "openai": ("src.llm.openai_provider", "OpenAIProvider"),
+    "groq": ("src.llm.openai_provider", "GroqProvider"),
+}
+# Optional SDK each built-in provider needs (probed without importing it)
+_PROVIDER_REQUIRES: Dict[str, str] = {
+    "gemini": "google.generativeai",
+    "openai": "openai",
+    "groq": "openai",
+}
+_providers: Dict[str, type] = {}  # Resolved and custom-registered classes
 _active_provider: Optional[LLMProvider] = None
 
 
 def register_provider(name: str, provider_class: type):
     """Register a new provider type"""
     _providers[name.lower()] = provider_class
+    _build_provider.cache_clear()
+    _available_message.cache_clear()
     logger.debug("provider_registered", name=name)
 
 
-def _register_default_providers():
-    """Register all default providers"""
-    global _providers
-    
-    # Ollama (always available)
-    from src.llm.ollama_provider import OllamaProvider
-    _providers["ollama"] = OllamaProvider
-    
-    # Gemini (requires google-generativeai)
-    try:
-        from src.llm.gemini_provider import GeminiProvider
-        _providers["gemini"] = GeminiProvider
-    except ImportError:
-        logger.debug("gemini_provider_unavailable", reason="google-generativeai not installed")
-    
-    # OpenAI/Groq (requires openai)
+def _resolve_provider_class(name: str) -> type:
+    """Get a provider class, importing its module on first use"""
+    provider_class = _providers.get(name)
+    if provider_class is None:
+        module_name, class_name = _PROVIDER_PATHS[name]
+        provider_class = getattr(importlib.import_module(module_name), class_name)
+        _providers[name] = provider_class
+    return provider_class
+
+
+@lru_cache(maxsize=None)
+def _module_installed(module_name: str) -> bool:
+    """Check whether a module can be imported, without importing it"""
     try:
-        from src.llm.openai_provider import OpenAIProvider, GroqProvider
-        _providers["openai"] = OpenAIProvider
-        _providers["groq"] = GroqProvider
-    except ImportError:
-        logger.debug("openai_provider_unavailable", reason="openai not installed")
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # Parent package missing (e.g. no "google" namespace)
+        return False
+
+
+def _provider_installed(name: str) -> bool:
+    """True if a built-in provider's module and SDK are both importable"""
+    module_name, _ = _PROVIDER_PATHS[name]
+    requirement = _PROVIDER_REQUIRES.get(name)
+    if requirement and not _module_installed(requirement):
+        logger.debug("provider_unavailable", name=name, reason=f"{requirement} not installed")
+        return False
+    return _module_installed(module_name)
 
 
 def list_available_providers() -> List[str]:
     """List all available provider types"""
-    if not _providers:
-        _register_default_providers()
-    return list(_providers.keys())
+    built_in = [name for name in _PROVIDER_PATHS if _provider_installed(name)]
+    return list(dict.fromkeys([*built_in, *_providers]))
+
+
+@lru_cache(maxsize=1)
+def _available_message() -> str:
+    """Error suffix for unknown providers (rebuilt only on registration)"""
+    return f"Available providers: {list_available_providers()}"
 
 
 def get_llm_provider(
@@ -80,6 +108,9 @@ def get_llm_provider(
     """
     Get or create an LLM provider instance.
     
+    Instances are shared between calls with identical arguments, so client
+    setup (HTTP pools, TLS) is paid once per configuration.
+    
     Args:
         provider: Provider type ("ollama", "gemini", "openai", "groq")
                   If None, uses LLM_PROVIDER env var or defaults to "ollama"
@@ -100,32 +131,39 @@ def get_llm_provider(
         # Groq (ultra-fast)
         llm = get_llm_provider("groq", model="llama-3.1-8b-instant")
     """
-    global _active_provider
-    
-    # Ensure providers are registered
-    if not _providers:
-        _register_default_providers()
-    
     # Determine provider type
     provider_name = (
         provider or 
-        os.getenv("LLM_PROVIDER") or 
+        _env("LLM_PROVIDER") or 
         "ollama"
     ).lower()
     
     # Check if provider is available
-    if provider_name not in _providers:
-        available = list(_providers.keys())
-        raise ValueError(
-            f"Unknown provider: {provider_name}. "
-            f"Available providers: {available}"
-        )
+    if provider_name not in _providers and provider_name not in _PROVIDER_PATHS:
+        raise ValueError(f"Unknown provider: {provider_name}. {_available_message()}")
     
+    # Reuse the instance (and its HTTP clients) for identical configurations
+    frozen_kwargs = tuple(sorted(kwargs.items()))
+    try:
+        hash(frozen_kwargs)
+    except TypeError:
+        # Unhashable config values - build a fresh, uncached instance
+        return _build_provider.__wrapped__(provider_name, model, frozen_kwargs)
+    return _build_provider(provider_name, model, frozen_kwargs)
+
+
+@lru_cache(maxsize=32)
+def _build_provider(
+    provider_name: str,
+    model: Optional[str],
+    frozen_kwargs: Tuple[Tuple[str, Any], ...]
+) -> LLMProvider:
+    """Create a provider instance (memoized per provider, model and kwargs)"""
     # Get provider class
-    provider_class = _providers[provider_name]
+    provider_class = _resolve_provider_class(provider_name)
     
     # Build kwargs
-    provider_kwargs = {**kwargs}
+    provider_kwargs = dict(frozen_kwargs)
     if model:
         provider_kwargs["model_name"] = model
     
@@ -145,14 +183,11 @@ def get_llm_provider(
 
     # Create provider instance
     try:
-        # Debug logging
-        if "api_key" in provider_kwargs:
-            masked_key = provider_kwargs["api_key"][:4] + "..." if provider_kwargs["api_key"] else "None"
-            logger.info("injecting_api_key", provider=provider_name, key_prefix=masked_key)
-            print(f"DEBUG: Injecting API key for {provider_name}: {masked_key}")
-        else:
-            logger.info("no_api_key_in_kwargs", provider=provider_name)
-            print(f"DEBUG: No API key provided for {provider_name}")
+        logger.debug(
+            "api_key_injection",
+            provider=provider_name,
+            has_key=bool(provider_kwargs.get("api_key"))
+        )
 
         instance = provider_class(**provider_kwargs)
         logger.info(
@@ -188,27 +223,27 @@ def get_default_provider() -> LLMProvider:
         return _active_provider
     
     # Check env var first
-    provider = os.getenv("LLM_PROVIDER")
+    provider = _env("LLM_PROVIDER")
     if provider:
         _active_provider = get_llm_provider(provider)
         return _active_provider
     
     # Auto-detect based on API keys
-    if os.getenv("GOOGLE_API_KEY"):
+    if _env("GOOGLE_API_KEY"):
         try:
             _active_provider = get_llm_provider("gemini")
             return _active_provider
         except Exception:
             pass
     
-    if os.getenv("GROQ_API_KEY"):
+    if _env("GROQ_API_KEY"):
         try:
             _active_provider = get_llm_provider("groq")
             return _active_provider
         except Exception:
             pass
     
-    if os.getenv("OPENAI_API_KEY"):
+    if _env("OPENAI_API_KEY"):
         try:
             _active_provider = get_llm_provider("openai")
             return _active_provider
@@ -228,10 +263,8 @@ def set_default_provider(provider: LLMProvider):
 
 
 def reset_provider():
-    """Reset the active provider (forces re-creation on next call)"""
+    """Reset the active provider and cached instances (forces re-creation on next call)"""
     global _active_provider
     _active_provider = None
-
-
-# Auto-register providers on import
-_register_default_providers()
+    _build_provider.cache_clear()
+    _env.cache_clear()
@@ -19,30 +19,24 @@ Environment:
 
 import asyncio
 import time
-import os
-from typing import Dict, Any, AsyncGenerator, Optional
+from functools import cache
+from typing import Dict, Any, AsyncGenerator, Optional, Tuple
 
-from src.llm.base import LLMProvider, LLMProviderType, LLMResponse
+from src.llm.base import LLMProvider, LLMProviderType, LLMResponse, _env
 import structlog
 
 logger = structlog.get_logger(__name__)
 
-# Lazy import to avoid dependency issues
-genai = None
-
-
-def _ensure_genai():
-    """Lazy load google.generativeai"""
-    global genai
-    if genai is None:
-        try:
-            import google.generativeai as _genai
-            genai = _genai
-        except ImportError:
-            raise ImportError(
-                "google-generativeai is required for Gemini provider. "
-                "Install with: pip install google-generativeai"
-            )
+@cache
+def _genai_module():
+    """Lazy load google.generativeai (resolved once per process)"""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        raise ImportError(
+            "google-generativeai is required for Gemini provider. "
+            "Install with: pip install google-generativeai"
+        )
     return genai
 
 
@@ -77,17 +71,20 @@ class GeminiProvider(LLMProvider):
             
         super().__init__(model_name, **kwargs)
         
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.api_key = api_key or _env("GOOGLE_API_KEY")
         self.temperature = temperature
         self.max_output_tokens = max_output_tokens
         
+        # Provider/model context bound once for the error paths
+        self.log = logger.bind(provider=self.provider_type.value, model=self.model_name)
+        
         if not self.api_key:
             logger.warning("gemini_no_api_key", message="GOOGLE_API_KEY not set")
             self._initialized = False
             return
         
         # Initialize Gemini
-        _genai = _ensure_genai()
+        _genai = _genai_module()
         _genai.configure(api_key=self.api_key)
         
         # Create model instance
@@ -125,35 +122,10 @@ class GeminiProvider(LLMProvider):
             
             latency_ms = (time.time() - start_time) * 1000
             
-            # Extract text
-            text = response.text if hasattr(response, 'text') else str(response)
-            
-            # Get token counts if available
-            input_tokens = self.count_tokens(prompt)
-            output_tokens = self.count_tokens(text)
-            
-            # Try to get actual token counts from response
-            if hasattr(response, 'usage_metadata'):
-                usage = response.usage_metadata
-                if hasattr(usage, 'prompt_token_count'):
-                    input_tokens = usage.prompt_token_count
-                if hasattr(usage, 'candidates_token_count'):
-                    output_tokens = usage.candidates_token_count
-            
-            return LLMResponse(
-                text=text,
-                provider=self.provider_type.value,
-                model=self.model_name,
-                latency_ms=latency_ms,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                total_tokens=input_tokens + output_tokens,
-                finish_reason=response.candidates[0].finish_reason.name if response.candidates else "unknown",
-                metadata={"temperature": self.temperature}
-            )
+            return self._parse_response(response, prompt, latency_ms)
             
         except Exception as e:
-            logger.error("gemini_generate_error", error=str(e))
+            self.log.error("gemini_generate_error", error=str(e))
             raise
     
     async def generate_async(self, prompt: str, **kwargs) -> LLMResponse:
@@ -161,6 +133,10 @@ class GeminiProvider(LLMProvider):
         if not self._initialized:
             raise RuntimeError("Gemini provider not initialized. Check API key.")
         
+        cached = self._cache_lookup(prompt, kwargs)
+        if cached is not None:
+            return cached
+        
         start_time = time.time()
         
         try:
@@ -169,34 +145,40 @@ class GeminiProvider(LLMProvider):
             
             latency_ms = (time.time() - start_time) * 1000
             
-            text = response.text if hasattr(response, 'text') else str(response)
-            
-            input_tokens = self.count_tokens(prompt)
-            output_tokens = self.count_tokens(text)
-            
-            if hasattr(response, 'usage_metadata'):
-                usage = response.usage_metadata
-                if hasattr(usage, 'prompt_token_count'):
-                    input_tokens = usage.prompt_token_count
-                if hasattr(usage, 'candidates_token_count'):
-                    output_tokens = usage.candidates_token_count
-            
-            return LLMResponse(
-                text=text,
-                provider=self.provider_type.value,
-                model=self.model_name,
-                latency_ms=latency_ms,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                total_tokens=input_tokens + output_tokens,
-                finish_reason=response.candidates[0].finish_reason.name if response.candidates else "unknown",
-                metadata={"temperature": self.temperature}
-            )
+            result = self._parse_response(response, prompt, latency_ms)
+            self._cache_store(prompt, kwargs, result)
+            return result
             
         except Exception as e:
-            logger.error("gemini_async_error", error=str(e))
+            self.log.error("gemini_async_error", error=str(e))
             raise
     
+    def _parse_response(self, response: Any, prompt: str, latency_ms: float) -> LLMResponse:
+        """Convert a generate_content result into an LLMResponse"""
+        text = getattr(response, 'text', None)
+        if text is None:
+            text = str(response)
+        input_tokens, output_tokens = self._token_counts(response, prompt, text)
+        
+        candidates = response.candidates
+        finish_reason = candidates[0].finish_reason.name if candidates else "unknown"
+        
+        return self._build_response(
+            text, latency_ms, input_tokens, output_tokens,
+            finish_reason, {"temperature": self.temperature}
+        )
+    
+    def _token_counts(self, response: Any, prompt: str, text: str) -> Tuple[int, int]:
+        """Use the API's usage metadata; only count locally what it doesn't report"""
+        usage = getattr(response, 'usage_metadata', None)
+        input_tokens = getattr(usage, 'prompt_token_count', None)
+        if input_tokens is None:
+            input_tokens = self.count_tokens(prompt)
+        output_tokens = getattr(usage, 'candidates_token_count', None)
+        if output_tokens is None:
+            output_tokens = self.count_tokens(text)
+        return input_tokens, output_tokens
+    
     async def generate_stream(
         self, 
         prompt: str, 
@@ -216,15 +198,21 @@ class GeminiProvider(LLMProvider):
             )
             
             async for chunk in response:
-                if hasattr(chunk, 'text') and chunk.text:
-                    yield chunk.text
+                text = getattr(chunk, 'text', None)
+                if text:
+                    yield text
                     
         except Exception as e:
-            logger.error("gemini_stream_error", error=str(e))
+            self.log.error("gemini_stream_error", error=str(e))
             raise
     
-    def health_check(self) -> Dict[str, Any]:
-        """Check Gemini API connectivity"""
+    def ping(self) -> None:
+        """Fetch model metadata - no generation cost"""
+        name = self.model_name if self.model_name.startswith("models/") else f"models/{self.model_name}"
+        _genai_module().get_model(name, request_options={"timeout": self.ping_timeout})
+    
+    def _check_health(self, deep: bool) -> Dict[str, Any]:
+        """Check Gemini API connectivity (deep=True runs a generation)"""
         if not self._initialized:
             return {
                 "status": "unhealthy",
@@ -235,7 +223,10 @@ class GeminiProvider(LLMProvider):
         
         try:
             start = time.time()
-            response = self.model.generate_content("Hi")
+            if deep:
+                self.model.generate_content("Hi")
+            else:
+                self.ping()
             latency = (time.time() - start) * 1000
             
             return {
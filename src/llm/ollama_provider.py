@@ -10,11 +10,11 @@ Features:
 - Streaming support
 """
 
-import asyncio
+import json
 import time
 from typing import Dict, Any, AsyncGenerator
 
-from langchain_community.llms import Ollama
+import httpx
 
 from src.llm.base import LLMProvider, LLMProviderType, LLMResponse
 from src.config.settings import settings
@@ -48,14 +48,13 @@ class OllamaProvider(LLMProvider):
         self.num_ctx = num_ctx
         self.num_predict = num_predict
         
-        # Initialize Ollama client
-        self.client = Ollama(
-            model=self.model_name,
-            base_url=self.base_url,
-            timeout=timeout,
-            num_ctx=num_ctx,
-            num_predict=num_predict,
-        )
+        # Provider/model context bound once for the error paths
+        self.log = logger.bind(provider=self.provider_type.value, model=self.model_name)
+        
+        # Pooled keep-alive clients for Ollama's native API
+        self.client = httpx.Client(base_url=self.base_url, timeout=timeout)
+        self._http = httpx.AsyncClient(base_url=self.base_url, timeout=timeout)
+        self._options = {"num_ctx": num_ctx, "num_predict": num_predict}
         
         self._initialized = True
         logger.info(
@@ -73,35 +72,55 @@ class OllamaProvider(LLMProvider):
         start_time = time.time()
         
         try:
-            # Override defaults with kwargs
-            response = self.client.invoke(prompt)
-            
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Estimate tokens
-            input_tokens = self.count_tokens(prompt)
-            output_tokens = self.count_tokens(response)
-            
-            return LLMResponse(
-                text=response,
-                provider=self.provider_type.value,
-                model=self.model_name,
-                latency_ms=latency_ms,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                total_tokens=input_tokens + output_tokens,
-                finish_reason="stop",
-                metadata={"base_url": self.base_url}
-            )
+            result = self.client.post("/api/generate", json=self._payload(prompt))
+            result.raise_for_status()
+            return self._parse_result(prompt, result.json(), (time.time() - start_time) * 1000)
             
         except Exception as e:
-            logger.error("ollama_generate_error", error=str(e))
+            self.log.error("ollama_generate_error", error=str(e))
             raise
     
     async def generate_async(self, prompt: str, **kwargs) -> LLMResponse:
-        """Asynchronous generation using Ollama"""
-        # Ollama LangChain doesn't have native async, use thread pool
-        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+        """Asynchronous generation using Ollama (native async, no thread hop)"""
+        cached = self._cache_lookup(prompt, kwargs)
+        if cached is not None:
+            return cached
+        
+        start_time = time.time()
+        
+        try:
+            result = await self._http.post("/api/generate", json=self._payload(prompt))
+            result.raise_for_status()
+            response = self._parse_result(prompt, result.json(), (time.time() - start_time) * 1000)
+            
+        except Exception as e:
+            self.log.error("ollama_async_error", error=str(e))
+            raise
+        
+        self._cache_store(prompt, kwargs, response)
+        return response
+    
+    def _payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        """Request body for /api/generate"""
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "options": self._options
+        }
+    
+    def _parse_result(self, prompt: str, result: Dict[str, Any], latency_ms: float) -> LLMResponse:
+        """Convert an /api/generate result into an LLMResponse"""
+        text = result["response"]
+        
+        # Ollama reports exact counts; estimate if missing
+        input_tokens = result.get("prompt_eval_count") or self.count_tokens(prompt)
+        output_tokens = result.get("eval_count") or self.count_tokens(text)
+        
+        return self._build_response(
+            text, latency_ms, input_tokens, output_tokens,
+            result.get("done_reason", "stop"), {"base_url": self.base_url}
+        )
     
     async def generate_stream(
         self, 
@@ -109,24 +128,42 @@ class OllamaProvider(LLMProvider):
         **kwargs
     ) -> AsyncGenerator[str, None]:
         """
-        Streaming generation (simulated for Ollama LangChain).
+        True streaming generation via Ollama's native /api/generate.
         
-        Note: For true streaming, use Ollama's native API directly.
+        Yields each token chunk as its NDJSON line arrives.
         """
-        # For now, fall back to non-streaming
-        response = await self.generate_async(prompt, **kwargs)
-        
-        # Simulate streaming by yielding words
-        words = response.text.split()
-        for word in words:
-            yield word + " "
-            await asyncio.sleep(0.01)  # Small delay to simulate streaming
+        try:
+            async with self._http.stream("POST", "/api/generate", json=self._payload(prompt, stream=True)) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+        except Exception as e:
+            self.log.error("ollama_stream_error", error=str(e))
+            raise
+    
+    async def close(self):
+        """Close the pooled HTTP clients"""
+        self.client.close()
+        await self._http.aclose()
+    
+    def ping(self) -> None:
+        """List local models - no generation needed"""
+        self.client.get("/api/tags", timeout=self.ping_timeout).raise_for_status()
     
-    def health_check(self) -> Dict[str, Any]:
-        """Check Ollama connectivity"""
+    def _check_health(self, deep: bool) -> Dict[str, Any]:
+        """Check Ollama connectivity (deep=True runs a generation)"""
         try:
             start = time.time()
-            response = self.client.invoke("Hi")
+            if deep:
+                self.generate("Hi")
+            else:
+                self.ping()
             latency = (time.time() - start) * 1000
             
             return {
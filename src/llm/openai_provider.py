@@ -19,58 +19,59 @@ Environment:
 
 import asyncio
 import time
-import os
-from typing import Dict, Any, AsyncGenerator, Optional
+from functools import cache, lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, AsyncGenerator, Mapping, Optional, Tuple
 
-from src.llm.base import LLMProvider, LLMProviderType, LLMResponse
+from src.llm.base import LLMProvider, LLMProviderType, LLMResponse, _env
 import structlog
 
 logger = structlog.get_logger(__name__)
 
-# Lazy import
-openai_client = None
-
-
-def _ensure_openai():
-    """Lazy load openai"""
-    global openai_client
-    if openai_client is None:
-        try:
-            from openai import OpenAI, AsyncOpenAI
-            return OpenAI, AsyncOpenAI
-        except ImportError:
-            raise ImportError(
-                "openai is required for this provider. "
-                "Install with: pip install openai"
-            )
-    return openai_client
+@cache
+def _openai_classes() -> Tuple[type, type]:
+    """Resolve OpenAI/AsyncOpenAI once per process (lazy import)"""
+    try:
+        from openai import OpenAI, AsyncOpenAI
+    except ImportError:
+        raise ImportError(
+            "openai is required for this provider. "
+            "Install with: pip install openai"
+        )
+    return OpenAI, AsyncOpenAI
 
 
-class OpenAIProvider(LLMProvider):
+@lru_cache(maxsize=8)
+def _make_openai_clients(api_key: str, base_url: str):
     """
-    OpenAI and OpenAI-compatible LLM Provider.
+    Create one (OpenAI, AsyncOpenAI) pair per key/endpoint.
     
-    Works with:
-    - OpenAI: gpt-4o, gpt-4o-mini, gpt-3.5-turbo
-    - Groq: llama-3.1-70b-versatile, mixtral-8x7b-32768
-    - Any OpenAI-compatible API
+    Providers built for the same account reuse the same httpx pools, so
+    TCP/TLS connections survive across provider instances.
     """
-    
-    # Common model shortcuts
-    MODELS = {
-        # OpenAI
-        "gpt-4o": "gpt-4o",
-        "gpt-4o-mini": "gpt-4o-mini",
-        "gpt-4": "gpt-4-turbo-preview",
-        "gpt-3.5": "gpt-3.5-turbo",
-        # Groq shortcuts
-        "groq-llama": "llama-3.1-70b-versatile",
-        "groq-llama-8b": "llama-3.1-8b-instant",
-        "groq-mixtral": "mixtral-8x7b-32768",
-    }
-    
-    # Preset configurations for different providers
-    PRESETS = {
+    OpenAI, AsyncOpenAI = _openai_classes()
+    return (
+        OpenAI(api_key=api_key, base_url=base_url),
+        AsyncOpenAI(api_key=api_key, base_url=base_url)
+    )
+
+
+# Common model shortcuts
+_MODELS: Mapping[str, str] = MappingProxyType({
+    # OpenAI
+    "gpt-4o": "gpt-4o",
+    "gpt-4o-mini": "gpt-4o-mini",
+    "gpt-4": "gpt-4-turbo-preview",
+    "gpt-3.5": "gpt-3.5-turbo",
+    # Groq shortcuts
+    "groq-llama": "llama-3.1-70b-versatile",
+    "groq-llama-8b": "llama-3.1-8b-instant",
+    "groq-mixtral": "mixtral-8x7b-32768",
+})
+
+# Preset configurations for different providers
+_PRESETS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    name: MappingProxyType(config) for name, config in {
         "openai": {
             "base_url": "https://api.openai.com/v1",
             "api_key_env": "OPENAI_API_KEY",
@@ -86,7 +87,23 @@ class OpenAIProvider(LLMProvider):
             "api_key_env": "TOGETHER_API_KEY",
             "default_model": "meta-llama/Llama-3-70b-chat-hf"
         }
-    }
+    }.items()
+})
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI and OpenAI-compatible LLM Provider.
+    
+    Works with:
+    - OpenAI: gpt-4o, gpt-4o-mini, gpt-3.5-turbo
+    - Groq: llama-3.1-70b-versatile, mixtral-8x7b-32768
+    - Any OpenAI-compatible API
+    """
+    
+    # Frozen module-level tables (kept as class attributes for callers)
+    MODELS = _MODELS
+    PRESETS = _PRESETS
     
     def __init__(
         self,
@@ -99,42 +116,42 @@ class OpenAIProvider(LLMProvider):
         **kwargs
     ):
         # Apply preset if specified
-        if preset and preset in self.PRESETS:
-            config = self.PRESETS[preset]
+        config = _PRESETS.get(preset) if preset else None
+        if config is not None:
             base_url = base_url or config["base_url"]
-            api_key = api_key or os.getenv(config["api_key_env"])
+            api_key = api_key or _env(config["api_key_env"])
             if model_name == "gpt-4o-mini":  # default not overridden
                 model_name = config["default_model"]
         
         # Handle model shortcuts
-        if model_name in self.MODELS:
-            model_name = self.MODELS[model_name]
+        model_name = _MODELS.get(model_name, model_name)
         
         super().__init__(model_name, **kwargs)
         
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.api_key = api_key or _env("OPENAI_API_KEY")
         self.base_url = base_url or "https://api.openai.com/v1"
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.preset = preset
         
+        # Provider/model context bound once for the error paths
+        self.log = logger.bind(provider=self.provider_type.value, model=self.model_name)
+        
+        # Default create() arguments, built once
+        self._base_request = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens
+        }
+        self._stream_request = {**self._base_request, "stream": True}
+        
         if not self.api_key:
             logger.warning("openai_no_api_key", message="API key not set")
             self._initialized = False
             return
         
-        # Initialize clients
-        OpenAI, AsyncOpenAI = _ensure_openai()
-        
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
-        
-        self.async_client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        # Shared clients (and connection pools) per (api_key, base_url)
+        self.client, self.async_client = _make_openai_clients(self.api_key, self.base_url)
         
         self._initialized = True
         logger.info(
@@ -150,6 +167,21 @@ class OpenAIProvider(LLMProvider):
             return LLMProviderType.GROQ
         return LLMProviderType.OPENAI
     
+    def _request(
+        self,
+        prompt: str,
+        kwargs: Dict[str, Any],
+        template: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """create() arguments: a precomputed template plus per-call overrides"""
+        request = dict(template or self._base_request)
+        request["messages"] = [{"role": "user", "content": prompt}]
+        if kwargs:
+            for key in ("temperature", "max_tokens"):
+                if key in kwargs:
+                    request[key] = kwargs[key]
+        return request
+    
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Synchronous generation"""
         if not self._initialized:
@@ -158,32 +190,14 @@ class OpenAIProvider(LLMProvider):
         start_time = time.time()
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=kwargs.get("temperature", self.temperature),
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
-            )
+            response = self.client.chat.completions.create(**self._request(prompt, kwargs))
             
             latency_ms = (time.time() - start_time) * 1000
             
-            text = response.choices[0].message.content
-            usage = response.usage
-            
-            return LLMResponse(
-                text=text,
-                provider=self.provider_type.value,
-                model=self.model_name,
-                latency_ms=latency_ms,
-                input_tokens=usage.prompt_tokens if usage else 0,
-                output_tokens=usage.completion_tokens if usage else 0,
-                total_tokens=usage.total_tokens if usage else 0,
-                finish_reason=response.choices[0].finish_reason,
-                metadata={"base_url": self.base_url}
-            )
+            return self._parse_response(response, latency_ms)
             
         except Exception as e:
-            logger.error("openai_generate_error", error=str(e))
+            self.log.error("openai_generate_error", error=str(e))
             raise
     
     async def generate_async(self, prompt: str, **kwargs) -> LLMResponse:
@@ -191,37 +205,39 @@ class OpenAIProvider(LLMProvider):
         if not self._initialized:
             raise RuntimeError("Provider not initialized. Check API key.")
         
+        cached = self._cache_lookup(prompt, kwargs)
+        if cached is not None:
+            return cached
+        
         start_time = time.time()
         
         try:
-            response = await self.async_client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=kwargs.get("temperature", self.temperature),
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
-            )
+            response = await self.async_client.chat.completions.create(**self._request(prompt, kwargs))
             
             latency_ms = (time.time() - start_time) * 1000
             
-            text = response.choices[0].message.content
-            usage = response.usage
-            
-            return LLMResponse(
-                text=text,
-                provider=self.provider_type.value,
-                model=self.model_name,
-                latency_ms=latency_ms,
-                input_tokens=usage.prompt_tokens if usage else 0,
-                output_tokens=usage.completion_tokens if usage else 0,
-                total_tokens=usage.total_tokens if usage else 0,
-                finish_reason=response.choices[0].finish_reason,
-                metadata={"base_url": self.base_url}
-            )
+            result = self._parse_response(response, latency_ms)
+            self._cache_store(prompt, kwargs, result)
+            return result
             
         except Exception as e:
-            logger.error("openai_async_error", error=str(e))
+            self.log.error("openai_async_error", error=str(e))
             raise
     
+    def _parse_response(self, response: Any, latency_ms: float) -> LLMResponse:
+        """Convert a chat completion into an LLMResponse"""
+        choice = response.choices[0]
+        usage = response.usage
+        
+        return self._build_response(
+            choice.message.content, latency_ms,
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0,
+            choice.finish_reason,
+            {"base_url": self.base_url},
+            usage.total_tokens if usage else 0
+        )
+    
     async def generate_stream(
         self, 
         prompt: str, 
@@ -233,11 +249,7 @@ class OpenAIProvider(LLMProvider):
         
         try:
             stream = await self.async_client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=kwargs.get("temperature", self.temperature),
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
-                stream=True
+                **self._request(prompt, kwargs, self._stream_request)
             )
             
             async for chunk in stream:
@@ -245,11 +257,15 @@ class OpenAIProvider(LLMProvider):
                     yield chunk.choices[0].delta.content
                     
         except Exception as e:
-            logger.error("openai_stream_error", error=str(e))
+            self.log.error("openai_stream_error", error=str(e))
             raise
     
-    def health_check(self) -> Dict[str, Any]:
-        """Check API connectivity"""
+    def ping(self) -> None:
+        """List models - no generation cost, one short attempt"""
+        self.client.with_options(timeout=self.ping_timeout, max_retries=0).models.list()
+    
+    def _check_health(self, deep: bool) -> Dict[str, Any]:
+        """Check API connectivity (deep=True runs a generation)"""
         if not self._initialized:
             return {
                 "status": "unhealthy",
@@ -260,11 +276,14 @@ class OpenAIProvider(LLMProvider):
         
         try:
             start = time.time()
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": "Hi"}],
-                max_tokens=5
-            )
+            if deep:
+                self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{"role": "user", "content": "Hi"}],
+                    max_tokens=5
+                )
+            else:
+                self.ping()
             latency = (time.time() - start) * 1000
             
             return {
@@ -1,8 +1,29 @@
 """Memory module for caching and conversation history"""
-from src.memory.cache import ResponseCache, get_response_cache
-from src.memory.conversation import ConversationMemory, get_conversation_memory
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# the cache doesn't also load the conversation store and vice versa
+_EXPORTS = {
+    'ResponseCache': 'src.memory.cache',
+    'get_response_cache': 'src.memory.cache',
+    'ConversationMemory': 'src.memory.conversation',
+    'get_conversation_memory': 'src.memory.conversation',
+}
 
 __all__ = [
     'ResponseCache', 'get_response_cache',
     'ConversationMemory', 'get_conversation_memory'
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -5,18 +5,45 @@ Thread-safe implementation with proper locking
 """
 import hashlib
 import json
-from datetime import datetime, timedelta
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
 from typing import Dict, Any, Optional
 from threading import Lock
 import structlog
 
 logger = structlog.get_logger(__name__)
+_log_level = logging.getLogger(__name__)  # Cheap level check for hot-path debug events
+
+
+def _update_field(h, data: bytes):
+    """Feed one length-prefixed field into a hash (unambiguous concatenation)"""
+    h.update(len(data).to_bytes(4, "little"))
+    h.update(data)
+
+
+class _CacheShard:
+    """One independently locked slice of the cache"""
+    
+    __slots__ = ("cache", "lock", "max_size", "hits", "misses")
+    
+    def __init__(self, max_size: int):
+        self.cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()  # LRU order, oldest first
+        self.lock = Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
 
 
 class ResponseCache:
     """
     Thread-safe in-memory cache for LLM responses.
     
+    Entries are spread over independently locked shards (by the first
+    byte of the key digest), so concurrent workers rarely contend on the
+    same lock. Each shard is an LRU holding its share of max_size.
+    
     Benefits:
     - Instant responses for repeated queries (~1ms vs 300-500ms)
     - Reduced LLM load
@@ -24,46 +51,67 @@ class ResponseCache:
     - Thread-safe operations
     """
     
-    def __init__(self, ttl_minutes: int = 60, max_size: int = 1000):
+    def __init__(self, ttl_minutes: int = 60, max_size: int = 1000, num_shards: Optional[int] = None):
         """
         Initialize cache.
         
         Args:
             ttl_minutes: Time-to-live for cache entries
             max_size: Maximum number of entries
+            num_shards: Number of lock shards (default: up to 16, one per
+                        64 entries, so small caches keep exact LRU order)
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        if num_shards is None:
+            num_shards = max(1, min(16, max_size // 64))
+        
+        # Split capacity so the shards add up to exactly max_size
+        per_shard, extra = divmod(max_size, num_shards)
+        self._shards = [
+            _CacheShard(per_shard + (1 if i < extra else 0))
+            for i in range(num_shards)
+        ]
         self.ttl = timedelta(minutes=ttl_minutes)
+        self.ttl_seconds = ttl_minutes * 60.0
         self.max_size = max_size
-        self.hits = 0
-        self.misses = 0
-        self._lock = Lock()  # Thread safety
         
         logger.info("cache_initialized", 
                    ttl_minutes=ttl_minutes,
                    max_size=max_size,
+                   num_shards=num_shards,
                    thread_safe=True)
     
-    def _generate_key(self, query: str, context: Dict = None) -> str:
-        """Generate cache key from query and context"""
-        # Normalize query
-        normalized = query.lower().strip()
+    def _shard_for(self, key: bytes) -> _CacheShard:
+        """Route a key to its shard (digest bytes are uniformly distributed)"""
+        return self._shards[key[0] % len(self._shards)]
+    
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+    
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+    
+    def _generate_key(self, query: str, context: Dict = None) -> bytes:
+        """Generate cache key from query and context (raw 8-byte BLAKE2 digest)"""
+        h = hashlib.blake2b(digest_size=8)
         
-        # Include context in key if provided
-        if context:
-            cache_data = {
-                "query": normalized,
-                "context": context
-            }
+        # Normalize query (bytes.lower/strip are a cheaper ASCII-only path;
+        # non-ASCII text still gets full Unicode case folding)
+        if query.isascii():
+            _update_field(h, query.encode().strip().lower())
         else:
-            cache_data = {"query": normalized}
+            _update_field(h, query.lower().strip().encode())
         
-        # Hash to create key
-        key = hashlib.md5(
-            json.dumps(cache_data, sort_keys=True).encode()
-        ).hexdigest()
+        # Include context in key if provided. Each key and value is length
+        # prefixed and values are JSON encoded, so separators inside a value
+        # can't forge another context and 1 / "1" stay distinct
+        if context:
+            for k, v in sorted(context.items()):
+                _update_field(h, str(k).encode())
+                _update_field(h, json.dumps(v, sort_keys=True, default=repr).encode())
         
-        return key
+        return h.digest()
     
     def get(self, query: str, context: Dict = None) -> Optional[Dict[str, Any]]:
         """
@@ -77,24 +125,29 @@ class ResponseCache:
             Cached response or None
         """
         key = self._generate_key(query, context)
+        shard = self._shard_for(key)
         
-        with self._lock:  # Thread-safe access
-            if key in self.cache:
-                entry = self.cache[key]
-                
-                # Check if expired
-                if datetime.now() - entry['timestamp'] < self.ttl:
-                    self.hits += 1
-                    logger.debug("cache_hit", 
-                               query=query[:50],
-                               age_seconds=(datetime.now() - entry['timestamp']).total_seconds())
+        with shard.lock:  # Only this shard is locked
+            entry = shard.cache.get(key)
+            if entry is not None:
+                # Check if expired: one compare against the stored deadline
+                # (monotonic seconds, immune to clock changes)
+                remaining = entry['expires_at'] - time.monotonic()
+                if remaining > 0:
+                    shard.cache.move_to_end(key)  # Mark most recently used
+                    shard.hits += 1
+                    if _log_level.isEnabledFor(logging.DEBUG):
+                        logger.debug("cache_hit", 
+                                   query=query[:50],
+                                   age_seconds=self.ttl_seconds - remaining)
                     return entry['response']
                 else:
                     # Expired - remove
-                    del self.cache[key]
-                    logger.debug("cache_expired", query=query[:50])
+                    del shard.cache[key]
+                    if _log_level.isEnabledFor(logging.DEBUG):
+                        logger.debug("cache_expired", query=query[:50])
             
-            self.misses += 1
+            shard.misses += 1
             return None
     
     def set(self, query: str, response: Dict[str, Any], context: Dict = None):
@@ -107,61 +160,71 @@ class ResponseCache:
             context: Optional context for cache key
         """
         key = self._generate_key(query, context)
+        shard = self._shard_for(key)
         
-        with self._lock:  # Thread-safe access
-            # Evict BEFORE adding if at capacity (prevents race condition)
-            while len(self.cache) >= self.max_size:
-                self._evict_oldest_unsafe()  # Already inside lock
-            
-            self.cache[key] = {
+        with shard.lock:  # Only this shard is locked
+            shard.cache[key] = {
                 'response': response,
-                'timestamp': datetime.now(),
+                'expires_at': time.monotonic() + self.ttl_seconds,
                 'query': query[:100]  # Store for debugging
             }
+            shard.cache.move_to_end(key)
+            
+            # Inserts overflow by at most one entry, so a single O(1) pop
+            # of the LRU end restores capacity (no scan or loop needed)
+            if len(shard.cache) > shard.max_size:
+                shard.cache.popitem(last=False)
             
-            logger.debug("cache_set", 
-                        query=query[:50],
-                        cache_size=len(self.cache))
+            if _log_level.isEnabledFor(logging.DEBUG):
+                logger.debug("cache_set", 
+                            query=query[:50],
+                            shard_size=len(shard.cache))
     
-    def _evict_oldest_unsafe(self):
-        """Evict the oldest cache entry (MUST be called within lock!)"""
-        if not self.cache:
+    def _evict_oldest_unsafe(self, shard: _CacheShard):
+        """Evict the shard's least recently used entry in O(1) (MUST be called within shard lock!)"""
+        if not shard.cache:
             return
         
-        oldest_key = min(
-            self.cache.keys(),
-            key=lambda k: self.cache[k]['timestamp']
-        )
-        del self.cache[oldest_key]
-        logger.debug("cache_evicted", key=oldest_key)
+        oldest_key, _ = shard.cache.popitem(last=False)
+        if _log_level.isEnabledFor(logging.DEBUG):
+            logger.debug("cache_evicted", key=oldest_key)
     
     def _evict_oldest(self):
-        """Evict the oldest cache entry (thread-safe)"""
-        with self._lock:
-            self._evict_oldest_unsafe()
+        """Evict the least recently used entry of the fullest shard (thread-safe)"""
+        shard = max(self._shards, key=lambda s: len(s.cache))
+        with shard.lock:
+            self._evict_oldest_unsafe(shard)
     
     def clear(self):
         """Clear all cache entries (thread-safe)"""
-        with self._lock:
-            self.cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.cache.clear()
         logger.info("cache_cleared")
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics (thread-safe)"""
-        with self._lock:
-            total_requests = self.hits + self.misses
-            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
-            
-            return {
-                "size": len(self.cache),
-                "max_size": self.max_size,
-                "hits": self.hits,
-                "misses": self.misses,
-                "total_requests": total_requests,
-                "hit_rate_percent": round(hit_rate, 2),
-                "ttl_minutes": self.ttl.total_seconds() / 60,
-                "thread_safe": True
-            }
+        """Get cache statistics (each shard is locked only while it is read)"""
+        size = hits = misses = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.cache)
+                hits += shard.hits
+                misses += shard.misses
+        
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+        
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "num_shards": len(self._shards),
+            "hits": hits,
+            "misses": misses,
+            "total_requests": total_requests,
+            "hit_rate_percent": round(hit_rate, 2),
+            "ttl_minutes": self.ttl.total_seconds() / 60,
+            "thread_safe": True
+        }
 
 
 # Global singleton instance
@@ -3,19 +3,36 @@ Conversation Memory Manager
 Maintains conversation history for context-aware responses
 Thread-safe implementation with proper limits
 """
-from typing import Dict, List, Any
-from datetime import datetime, timedelta
-from collections import deque
+from typing import Dict, List, Any, Optional
+from datetime import timedelta
+from collections import OrderedDict, deque
 from threading import Lock
+import io
+import time
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+class _ConversationShard:
+    """Conversations whose ids hash to one lock"""
+    
+    __slots__ = ("conversations", "lock", "max_conversations")
+    
+    def __init__(self, max_conversations: int):
+        # Ordered by last update (least recently active first)
+        self.conversations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = Lock()
+        self.max_conversations = max_conversations
+
+
 class ConversationMemory:
     """
     Thread-safe conversation history manager with sliding window.
     
+    Conversations are partitioned by id over independently locked shards,
+    so concurrent conversations don't block each other's context fetches.
+    
     Features:
     - Maintains last N messages
     - Automatic cleanup of old conversations
@@ -28,7 +45,8 @@ class ConversationMemory:
         self, 
         max_messages: int = 10, 
         conversation_ttl_hours: int = 24,
-        max_conversations: int = 1000
+        max_conversations: int = 1000,
+        num_shards: Optional[int] = None
     ):
         """
         Initialize conversation memory.
@@ -37,19 +55,36 @@ class ConversationMemory:
             max_messages: Max messages to keep per conversation
             conversation_ttl_hours: Hours before conversation expires
             max_conversations: Maximum number of concurrent conversations
+            num_shards: Number of lock shards (default: up to 32, one per
+                        32 conversations, so small limits stay exact)
         """
-        self.conversations: Dict[str, Dict[str, Any]] = {}
+        if num_shards is None:
+            num_shards = max(1, min(32, max_conversations // 32))
+        # More shards than conversations would leave zero-capacity shards
+        num_shards = max(1, min(num_shards, max_conversations))
+        
+        # Split the conversation limit so the shards add up to exactly max_conversations
+        per_shard, extra = divmod(max_conversations, num_shards)
+        self._shards = [
+            _ConversationShard(max(1, per_shard + (1 if i < extra else 0)))
+            for i in range(num_shards)
+        ]
         self.max_messages = max_messages
         self.max_conversations = max_conversations
         self.ttl = timedelta(hours=conversation_ttl_hours)
-        self._lock = Lock()  # Thread safety
+        self.ttl_seconds = conversation_ttl_hours * 3600.0
         
         logger.info("memory_initialized",
                    max_messages=max_messages,
                    ttl_hours=conversation_ttl_hours,
                    max_conversations=max_conversations,
+                   num_shards=num_shards,
                    thread_safe=True)
     
+    def _shard_for(self, conversation_id: str) -> _ConversationShard:
+        """Route a conversation to its shard"""
+        return self._shards[hash(conversation_id) % len(self._shards)]
+    
     def add_message(self, conversation_id: str, role: str, content: str):
         """
         Add a message to conversation history (thread-safe).
@@ -59,28 +94,35 @@ class ConversationMemory:
             role: 'user' or 'assistant'
             content: Message content
         """
-        with self._lock:  # Thread-safe access
+        shard = self._shard_for(conversation_id)
+        with shard.lock:  # Only this conversation's shard is locked
+            now = time.monotonic()  # One clock read for the whole update
+            conversations = shard.conversations
+            
             # Enforce conversation limit
-            if conversation_id not in self.conversations:
-                while len(self.conversations) >= self.max_conversations:
-                    self._evict_oldest_conversation_unsafe()
+            if conversation_id not in conversations:
+                while len(conversations) >= shard.max_conversations:
+                    self._evict_oldest_conversation_unsafe(shard)
                 
-                self.conversations[conversation_id] = {
+                conversations[conversation_id] = {
                     'messages': deque(maxlen=self.max_messages),
-                    'created_at': datetime.now(),
-                    'last_updated': datetime.now()
+                    'created_at': now,
+                    'last_updated': now,
+                    'context_cache': None  # (max_messages, formatted context)
                 }
             
-            conv = self.conversations[conversation_id]
+            conv = conversations[conversation_id]
+            conversations.move_to_end(conversation_id)
             
             # Add message
             conv['messages'].append({
                 'role': role,
                 'content': content,
-                'timestamp': datetime.now()
+                'timestamp': now
             })
             
-            conv['last_updated'] = datetime.now()
+            conv['last_updated'] = now
+            conv['context_cache'] = None  # History changed
             
             logger.debug("message_added",
                         conversation_id=conversation_id,
@@ -98,11 +140,12 @@ class ConversationMemory:
         Returns:
             List of messages in format [{'role': 'user', 'content': '...'}, ...]
         """
-        with self._lock:
-            if conversation_id not in self.conversations:
+        shard = self._shard_for(conversation_id)
+        with shard.lock:
+            conv = shard.conversations.get(conversation_id)
+            if conv is None:
                 return []
             
-            conv = self.conversations[conversation_id]
             messages = list(conv['messages'])
             
             # Limit if requested
@@ -126,70 +169,90 @@ class ConversationMemory:
         Returns:
             Formatted conversation history
         """
-        history = self.get_history(conversation_id, max_messages)
-        
-        if not history:
-            return ""
-        
-        # Format as conversation
-        context_lines = []
-        for msg in history:
-            role = "User" if msg['role'] == 'user' else "Assistant"
-            context_lines.append(f"{role}: {msg['content']}")
-        
-        return "\n".join(context_lines)
+        shard = self._shard_for(conversation_id)
+        with shard.lock:
+            conv = shard.conversations.get(conversation_id)
+            if conv is None:
+                return ""
+            
+            # Reuse the formatted window until the next add_message
+            cached = conv['context_cache']
+            if cached is not None and cached[0] == max_messages:
+                return cached[1]
+            
+            messages = list(conv['messages'])
+            if max_messages:
+                messages = messages[-max_messages:]
+            
+            # Format as conversation, written straight into one buffer
+            buf = io.StringIO()
+            separator = ""
+            for msg in messages:
+                buf.write(separator)
+                buf.write("User: " if msg['role'] == 'user' else "Assistant: ")
+                buf.write(msg['content'])
+                separator = "\n"
+            
+            context = buf.getvalue()
+            conv['context_cache'] = (max_messages, context)
+            return context
     
     def clear_conversation(self, conversation_id: str):
         """Clear a specific conversation (thread-safe)"""
-        with self._lock:
-            if conversation_id in self.conversations:
-                del self.conversations[conversation_id]
+        shard = self._shard_for(conversation_id)
+        with shard.lock:
+            if shard.conversations.pop(conversation_id, None) is not None:
                 logger.info("conversation_cleared", conversation_id=conversation_id)
     
-    def _evict_oldest_conversation_unsafe(self):
-        """Evict oldest conversation (MUST be called within lock!)"""
-        if not self.conversations:
+    def _evict_oldest_conversation_unsafe(self, shard: _ConversationShard):
+        """Evict the shard's least recently active conversation in O(1) (MUST be called within shard lock!)"""
+        if not shard.conversations:
             return
         
-        oldest_id = min(
-            self.conversations.keys(),
-            key=lambda k: self.conversations[k]['created_at']
-        )
-        del self.conversations[oldest_id]
+        oldest_id, _ = shard.conversations.popitem(last=False)
         logger.debug("conversation_evicted", conversation_id=oldest_id)
     
     def cleanup_expired(self):
-        """Remove expired conversations (thread-safe)"""
-        with self._lock:
-            now = datetime.now()
-            expired_ids = []
-            
-            for conv_id, conv_data in self.conversations.items():
-                if now - conv_data['last_updated'] > self.ttl:
+        """Remove expired conversations (locks one shard at a time)"""
+        now = time.monotonic()
+        expired_count = 0
+        
+        for shard in self._shards:
+            with shard.lock:
+                expired_ids = []
+                
+                # Expired conversations cluster at the front; stop at the first live one
+                for conv_id, conv_data in shard.conversations.items():
+                    if now - conv_data['last_updated'] <= self.ttl_seconds:
+                        break
                     expired_ids.append(conv_id)
-            
-            for conv_id in expired_ids:
-                del self.conversations[conv_id]
-            
-            if expired_ids:
-                logger.info("conversations_expired", count=len(expired_ids))
+                
+                for conv_id in expired_ids:
+                    del shard.conversations[conv_id]
+                expired_count += len(expired_ids)
+        
+        if expired_count:
+            logger.info("conversations_expired", count=expired_count)
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get memory statistics (thread-safe)"""
-        with self._lock:
-            total_messages = sum(
-                len(conv['messages'])
-                for conv in self.conversations.values()
-            )
-            
-            return {
-                "active_conversations": len(self.conversations),
-                "total_messages": total_messages,
-                "max_messages_per_conversation": self.max_messages,
-                "max_conversations": self.max_conversations,
-                "ttl_hours": self.ttl.total_seconds() / 3600,
-                "thread_safe": True
-            }
+        """Get memory statistics (locks one shard at a time)"""
+        active_conversations = total_messages = 0
+        for shard in self._shards:
+            with shard.lock:
+                active_conversations += len(shard.conversations)
+                total_messages += sum(
+                    len(conv['messages'])
+                    for conv in shard.conversations.values()
+                )
+        
+        return {
+            "active_conversations": active_conversations,
+            "total_messages": total_messages,
+            "max_messages_per_conversation": self.max_messages,
+            "max_conversations": self.max_conversations,
+            "ttl_hours": self.ttl.total_seconds() / 3600,
+            "thread_safe": True
+        }
 
 
 # Global singleton instance
@@ -2,112 +2,262 @@
 KPI Dashboard - Real-time metrics and analytics.
 Displays key performance indicators for the AI system.
 """
-from typing import Dict, List, Any
+from typing import Dict, Any, List
 from datetime import datetime, timedelta
+from array import array
+from collections import deque
+import threading
 import json
+import time
+import weakref
+import numpy as np
 import structlog
 
+# Optional orjson for fast JSON export, falls back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logger = structlog.get_logger(__name__)
 
+# Metrics averaged over the records that report them
+_AVG_METRICS = (
+    "quality_score", "hallucination_score", "toxicity_score",
+    "satisfaction_score", "conversation_turns",
+)
+
+# Boolean metrics reported as the share of true values
+_RATE_METRICS = (
+    "guardrails_passed", "task_completed", "transferred", "success", "timeout",
+)
+
+
+class _KPIBucket:
+    """Running aggregates for one time slice of recorded metrics"""
+    
+    __slots__ = (
+        "start", "count", "latency_sum", "latencies", "tokens_sum", "cost_sum",
+        "sums", "counts", "conversations",
+    )
+    
+    def __init__(self, start: int):
+        self.start = start
+        self.count = 0
+        self.latency_sum = 0.0
+        self.latencies = array("f")  # float32 samples for percentiles
+        self.tokens_sum = 0
+        self.cost_sum = 0.0
+        self.sums: Dict[str, float] = {}  # metric -> sum (true count for rates)
+        self.counts: Dict[str, int] = {}  # metric -> records reporting it
+        self.conversations = set()
+    
+    def add(self, metrics: Dict[str, Any]):
+        """Fold one record into the aggregates"""
+        get = metrics.get
+        sums, counts = self.sums, self.counts
+        
+        self.count += 1
+        latency = get("latency", 0)
+        self.latency_sum += latency
+        self.latencies.append(latency)
+        self.tokens_sum += get("tokens", 0)
+        self.cost_sum += get("cost", 0)
+        
+        for key in _AVG_METRICS:
+            value = get(key)
+            if value is not None:
+                sums[key] = sums.get(key, 0.0) + value
+                counts[key] = counts.get(key, 0) + 1
+        for key in _RATE_METRICS:
+            value = get(key)
+            if value is not None:
+                sums[key] = sums.get(key, 0) + (1 if value else 0)
+                counts[key] = counts.get(key, 0) + 1
+        
+        conversation_id = get("conversation_id")
+        if conversation_id:
+            self.conversations.add(conversation_id)
+
+
+class _KPIStream:
+    """One recording thread's buckets (its lock is only contended by reports)"""
+    
+    __slots__ = ("buckets", "lock", "thread")
+    
+    def __init__(self, max_buckets: int):
+        self.buckets = deque(maxlen=max_buckets)
+        self.lock = threading.Lock()
+        self.thread = weakref.ref(threading.current_thread())
+
 
 class KPIDashboard:
     """
     Tracks and reports KPIs for the voice AI platform.
+    
+    Metrics are folded into fixed-size time buckets as they are recorded,
+    so a report only combines the buckets inside the window instead of
+    re-scanning every record. Each recording thread writes to its own
+    bucket stream, so request handlers never wait on each other; reports
+    merge the streams.
     """
     
-    def __init__(self):
-        self.metrics_history = []
+    def __init__(
+        self,
+        bucket_seconds: int = 60,
+        retention: timedelta = timedelta(hours=24),
+        max_history: int = 100_000
+    ):
+        """
+        Initialize the dashboard.
+        
+        Args:
+            bucket_seconds: Width of each aggregation bucket
+            retention: How far back reports can look (older buckets are dropped)
+            max_history: Raw records kept in metrics_history (oldest dropped first)
+        """
+        self.metrics_history = deque(maxlen=max_history)
+        self.bucket_seconds = bucket_seconds
+        self._max_buckets = max(1, int(retention.total_seconds() // bucket_seconds))
+        self._local = threading.local()
+        self._streams: List[_KPIStream] = []
+        self._streams_lock = threading.Lock()  # Guards registration only
         logger.info("kpi_dashboard_initialized")
     
     def record_conversation_metrics(self, metrics: Dict[str, Any]):
         """Record metrics from a conversation."""
         metrics["timestamp"] = datetime.now().isoformat()
         self.metrics_history.append(metrics)
+        
+        now = time.time()
+        start = int(now - now % self.bucket_seconds)
+        stream = self._stream()
+        with stream.lock:
+            buckets = stream.buckets
+            if not buckets or buckets[-1].start != start:
+                buckets.append(_KPIBucket(start))
+            buckets[-1].add(metrics)
+    
+    def _stream(self) -> _KPIStream:
+        """This thread's bucket stream (registered on first use)"""
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            stream = _KPIStream(self._max_buckets)
+            self._local.stream = stream
+            with self._streams_lock:
+                self._streams.append(stream)
+        return stream
+    
+    def _live_streams(self) -> List[_KPIStream]:
+        """Snapshot registered streams, dropping those of exited threads whose data is past retention"""
+        horizon = time.time() - self._max_buckets * self.bucket_seconds
+        with self._streams_lock:
+            self._streams = [
+                st for st in self._streams
+                if st.thread() is not None or (st.buckets and st.buckets[-1].start > horizon)
+            ]
+            return list(self._streams)
     
     def get_performance_kpis(self, time_window: timedelta = timedelta(hours=24)) -> Dict[str, Any]:
         """
         Get performance KPIs for the specified time window.
         
+        The window is resolved at bucket granularity.
+        
         Returns:
             Dictionary of KPIs
         """
-        cutoff = datetime.now() - time_window
+        cutoff = time.time() - time_window.total_seconds()
         
-        # Filter recent metrics
-        recent = [
-            m for m in self.metrics_history
-            if datetime.fromisoformat(m["timestamp"]) > cutoff
-        ]
+        # One pass over the buckets in the window, merging every aggregate
+        bucket_start = cutoff - self.bucket_seconds  # Buckets starting after this overlap the window
+        total_requests = total_tokens = 0
+        total_latency = total_cost = 0.0
+        sums: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        conversations = set()
+        samples = array("f")  # Copied, so recorders can keep appending
+        for stream in self._live_streams():
+            with stream.lock:
+                # Buckets are in time order: walk back from the newest and stop
+                # at the first one outside the window (no per-record timestamps)
+                for b in reversed(stream.buckets):
+                    if b.start <= bucket_start:
+                        break
+                    total_requests += b.count
+                    total_latency += b.latency_sum
+                    total_tokens += b.tokens_sum
+                    total_cost += b.cost_sum
+                    for key, value in b.sums.items():
+                        sums[key] = sums.get(key, 0) + value
+                    for key, value in b.counts.items():
+                        counts[key] = counts.get(key, 0) + value
+                    conversations |= b.conversations
+                    samples.extend(b.latencies)
         
-        if not recent:
+        if not total_requests:
             return {"error": "No data in time window"}
         
-        # Calculate KPIs
-        latencies = [m.get("latency", 0) for m in recent]
-        token_counts = [m.get("tokens", 0) for m in recent]
-        costs = [m.get("cost", 0) for m in recent]
+        # Percentiles via one O(n) partition over float32 samples
+        latencies = np.frombuffer(samples, dtype=np.float32)
+        ranks = [total_requests // 2, int(total_requests * 0.95), int(total_requests * 0.99)]
+        p50, p95, p99 = (float(v) * 1000 for v in np.partition(latencies, ranks)[ranks])
+        
+        def rate(key: str) -> float:
+            count = counts.get(key)
+            return sums[key] / count if count else 0.0
+        
+        success_rate = rate("success")
         
-        kpis = {
+        return {
             # Performance Metrics
             "performance": {
-                "total_requests": len(recent),
-                "avg_latency_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0,
-                "p50_latency_ms": sorted(latencies)[len(latencies) // 2] * 1000 if latencies else 0,
-                "p95_latency_ms": sorted(latencies)[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
-                "p99_latency_ms": sorted(latencies)[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+                "total_requests": total_requests,
+                "avg_latency_ms": total_latency / total_requests * 1000,
+                "p50_latency_ms": p50,
+                "p95_latency_ms": p95,
+                "p99_latency_ms": p99,
             },
             
             # Quality Metrics
             "quality": {
-                "avg_response_quality": self._avg_metric(recent, "quality_score"),
-                "guardrail_pass_rate": self._pass_rate(recent, "guardrails_passed"),
-                "hallucination_rate": self._avg_metric(recent, "hallucination_score"),
-                "toxicity_rate": self._avg_metric(recent, "toxicity_score"),
+                "avg_response_quality": rate("quality_score"),
+                "guardrail_pass_rate": rate("guardrails_passed"),
+                "hallucination_rate": rate("hallucination_score"),
+                "toxicity_rate": rate("toxicity_score"),
             },
             
             # Usage Metrics
             "usage": {
-                "total_tokens": sum(token_counts),
-                "avg_tokens_per_request": sum(token_counts) / len(token_counts) if token_counts else 0,
-                "total_conversations": len(set(m.get("conversation_id") for m in recent if m.get("conversation_id"))),
+                "total_tokens": total_tokens,
+                "avg_tokens_per_request": total_tokens / total_requests,
+                "total_conversations": len(conversations),
             },
             
             # Cost Metrics
             "cost": {
-                "total_cost_usd": sum(costs),
-                "avg_cost_per_request": sum(costs) / len(costs) if costs else 0,
-                "cost_per_1k_requests": (sum(costs) / len(costs) * 1000) if costs else 0,
+                "total_cost_usd": total_cost,
+                "avg_cost_per_request": total_cost / total_requests,
+                "cost_per_1k_requests": total_cost / total_requests * 1000,
             },
             
             # Business Metrics
             "business": {
-                "task_completion_rate": self._pass_rate(recent, "task_completed"),
-                "user_satisfaction": self._avg_metric(recent, "satisfaction_score"),
-                "avg_conversation_length": self._avg_metric(recent, "conversation_turns"),
-                "transfer_rate": self._pass_rate(recent, "transferred"),
+                "task_completion_rate": rate("task_completed"),
+                "user_satisfaction": rate("satisfaction_score"),
+                "avg_conversation_length": rate("conversation_turns"),
+                "transfer_rate": rate("transferred"),
             },
             
             # Reliability Metrics
             "reliability": {
-                "success_rate": self._pass_rate(recent, "success"),
-                "error_rate": 1 - self._pass_rate(recent, "success"),
-                "timeout_rate": self._pass_rate(recent, "timeout"),
+                "success_rate": success_rate,
+                "error_rate": 1 - success_rate,
+                "timeout_rate": rate("timeout"),
             }
         }
-        
-        return kpis
-    
-    def _avg_metric(self, data: List[Dict], key: str) -> float:
-        """Calculate average for a metric."""
-        values = [d.get(key) for d in data if d.get(key) is not None]
-        return sum(values) / len(values) if values else 0.0
-    
-    def _pass_rate(self, data: List[Dict], key: str) -> float:
-        """Calculate pass/true rate for a boolean metric."""
-        values = [d.get(key) for d in data if d.get(key) is not None]
-        if not values:
-            return 0.0
-        return sum(1 for v in values if v) / len(values)
     
     def generate_report(self, time_window: timedelta = timedelta(hours=24)) -> str:
         """
@@ -171,8 +321,12 @@ class KPIDashboard:
         """Export KPIs to JSON file."""
         kpis = self.get_performance_kpis()
         
-        with open(filepath, "w") as f:
-            json.dump(kpis, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(kpis, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, "w") as f:
+                json.dump(kpis, f, indent=2)
         
         logger.info("kpi_report_exported", filepath=filepath)
 
@@ -10,27 +10,22 @@ from structlog.types import EventDict, Processor
 from pythonjsonlogger import jsonlogger
 
 
-def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
-    """Add application-wide context to all log events."""
-    event_dict["app"] = "voicebot"
-    event_dict["environment"] = "production"  # Override from config
-    return event_dict
-
-
-def add_trace_id(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
-    """Add trace ID for request correlation."""
-    # Will be populated by middleware
-    trace_id = structlog.contextvars.get_contextvars().get("trace_id")
-    if trace_id:
-        event_dict["trace_id"] = trace_id
-    return event_dict
+# Static fields stamped on every event (built once, not per call)
+_APP_CONTEXT = {
+    "app": "voicebot",
+    "environment": "production",  # Override from config
+}
 
 
-def add_user_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
-    """Add user context for security and debugging."""
-    user_id = structlog.contextvars.get_contextvars().get("user_id")
-    if user_id:
-        event_dict["user_id"] = user_id
+def add_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """
+    Add application-wide context to all log events.
+    
+    Request context (trace_id from middleware, user_id) is bound with
+    structlog.contextvars and already merged by merge_contextvars, so only
+    the static application fields are added here.
+    """
+    event_dict.update(_APP_CONTEXT)
     return event_dict
 
 
@@ -44,9 +39,7 @@ def configure_logging(log_level: str = "INFO") -> None:
     # Configure structlog processors
     processors: list[Processor] = [
         structlog.contextvars.merge_contextvars,
-        add_app_context,
-        add_trace_id,
-        add_user_context,
+        add_context,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
@@ -65,9 +58,20 @@ def configure_logging(log_level: str = "INFO") -> None:
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard library logging
+    # Configure standard library logging. Records from plain stdlib loggers
+    # (third-party libraries, tracing hot paths) get the same fields, with
+    # their ``extra=`` dict lifted into the event.
+    foreign_pre_chain: list[Processor] = [
+        structlog.contextvars.merge_contextvars,
+        add_context,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.ExtraAdder(),
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
     formatter = structlog.stdlib.ProcessorFormatter(
         processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=foreign_pre_chain,
     )
     
     handler = logging.StreamHandler(sys.stdout)
@@ -2,22 +2,265 @@
 Prometheus metrics collection for monitoring AI system performance.
 Tracks latency, costs, quality, and business KPIs.
 """
-from typing import Dict, Any
+import io
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Tuple
 from prometheus_client import (
     Counter,
     Histogram,
     Gauge,
-    Summary,
     CollectorRegistry,
-    generate_latest,
     CONTENT_TYPE_LATEST
 )
+from prometheus_client.utils import floatToGoString
 import structlog
 
 from src.config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+# Distinct values admitted per free-form label before collapsing to "other"
+_CARDINALITY_LIMIT = 1000
+_OTHER = "other"
+
+# Label values known at startup, materialized before the first request
+_LLM_STATUSES = ("success", "error")
+_GUARDRAIL_SEVERITIES = {
+    "pii_detection": "high",
+    "toxicity": "medium",
+    "prompt_injection": "critical",
+}
+
+# Raw path segments that identify a resource rather than a route
+_ENDPOINT_PATTERNS = (
+    (re.compile(r"/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)"), "/:id"),
+    (re.compile(r"/[A-Za-z]+_[0-9a-fA-F]{8,}(?=/|$)"), "/:id"),
+    (re.compile(r"/[0-9a-fA-F]{16,}(?=/|$)"), "/:id"),
+    (re.compile(r"/\d+(?=/|$)"), "/:id"),
+)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_endpoint(path: str) -> str:
+    """Collapse ID-like path segments, e.g. ``/users/123/foo`` -> ``/users/:id/foo``."""
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class _LabelLimiter:
+    """
+    Bound the values a single label may take.
+    
+    Values outside a non-empty allowlist map to ``"other"``; once
+    ``_CARDINALITY_LIMIT`` distinct values have been seen, new ones do too.
+    """
+    
+    __slots__ = ("allowed", "seen")
+    
+    def __init__(self, allowed: Iterable[str] = ()):
+        self.allowed = frozenset(allowed)
+        self.seen = set()
+    
+    def __call__(self, value: str) -> str:
+        if self.allowed and value not in self.allowed:
+            return _OTHER
+        if value not in self.seen:
+            if len(self.seen) >= _CARDINALITY_LIMIT:
+                return _OTHER
+            self.seen.add(value)
+        return value
+
+
+def _child_cache(metric, maxsize: int = 4096):
+    """
+    Memoize ``metric.labels`` by positional label values.
+
+    prometheus_client re-validates and re-hashes the label tuple under a lock
+    on every ``labels()`` call; caching the returned child turns repeat
+    lookups into a single lru_cache hit.
+    """
+    return lru_cache(maxsize=maxsize)(metric.labels)
+
+
+class _LLMMetricBundle:
+    """The five LLM metric children for one (model, provider, status), resolved once."""
+    
+    __slots__ = ("calls", "latency", "tokens_in", "tokens_out", "cost")
+    
+    def __init__(self, collector: "MetricsCollector", model: str, provider: str, status: str):
+        self.calls = collector.llm_calls.labels(model, provider, status)
+        self.latency = collector.llm_latency.labels(model, provider)
+        self.tokens_in = collector.llm_tokens.labels(model, "input")
+        self.tokens_out = collector.llm_tokens.labels(model, "output")
+        self.cost = collector.llm_cost.labels(model, provider)
+
+
+class _DirectSink:
+    """Apply metric updates immediately (the default outside ``batch()``)."""
+    
+    __slots__ = ()
+    
+    @staticmethod
+    def inc(child, amount: float = 1.0):
+        child.inc(amount)
+    
+    @staticmethod
+    def observe(child, value: float):
+        child.observe(value)
+
+
+class _MetricBatch:
+    """
+    Accumulate metric updates and apply them in one pass.
+    
+    Counter increments are summed per labeled child so each child's lock is
+    taken once per flush; histogram observations are kept in order and
+    replayed at flush.
+    """
+    
+    __slots__ = ("counts", "observations")
+    
+    def __init__(self):
+        self.counts: Dict[Any, float] = {}
+        self.observations: Dict[Any, list] = {}
+    
+    def inc(self, child, amount: float = 1.0):
+        self.counts[child] = self.counts.get(child, 0.0) + amount
+    
+    def observe(self, child, value: float):
+        values = self.observations.get(child)
+        if values is None:
+            self.observations[child] = [value]
+        else:
+            values.append(value)
+    
+    def flush(self):
+        for child, amount in self.counts.items():
+            child.inc(amount)
+        for child, values in self.observations.items():
+            observe = child.observe
+            for value in values:
+                observe(value)
+        self.counts.clear()
+        self.observations.clear()
+
+
+_DIRECT = _DirectSink()
+_active_batch: ContextVar[Any] = ContextVar("metrics_batch", default=None)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+class _TextExporter:
+    """
+    Prometheus text-format writer that keeps its work between scrapes.
+    
+    Produces the same bytes as ``generate_latest`` but reuses one string
+    buffer and caches the ``# HELP``/``# TYPE`` headers per metric family and
+    the rendered ``{...}`` label block per label set.
+    """
+    
+    _OM_SUFFIXES = ('_created', '_gsum', '_gcount')
+    _TYPE_RENAMES = {
+        'info': 'gauge',
+        'stateset': 'gauge',
+        'gaugehistogram': 'histogram',
+        'unknown': 'untyped',
+    }
+    
+    def __init__(self, registry: CollectorRegistry, max_label_sets: int = 10_000):
+        self.registry = registry
+        self.max_label_sets = max_label_sets
+        self._buf = io.StringIO()
+        self._lock = threading.Lock()
+        self._headers: Dict[tuple, tuple] = {}
+        self._label_blocks: Dict[tuple, str] = {}
+    
+    def _family_header(self, metric) -> tuple:
+        """Return (header, {om sample name: suffix}, {suffix: om header}) for a family."""
+        key = (metric.name, metric.type, metric.documentation)
+        cached = self._headers.get(key)
+        if cached is None:
+            name, mtype, doc = metric.name, metric.type, _escape_help(metric.documentation)
+            if mtype == 'counter':
+                mname = name + '_total'
+            elif mtype == 'info':
+                mname = name + '_info'
+            else:
+                mname = name
+            mtype = self._TYPE_RENAMES.get(mtype, mtype)
+            header = f'# HELP {mname} {doc}\n# TYPE {mname} {mtype}\n'
+            om_names = {name + suffix: suffix for suffix in self._OM_SUFFIXES}
+            om_headers = {
+                suffix: f'# HELP {name}{suffix} {doc}\n# TYPE {name}{suffix} gauge\n'
+                for suffix in self._OM_SUFFIXES
+            }
+            cached = self._headers[key] = (header, om_names, om_headers)
+        return cached
+    
+    def _label_block(self, labels: Dict[str, str]) -> str:
+        if not labels:
+            return ''
+        key = tuple(labels.items())
+        block = self._label_blocks.get(key)
+        if block is None:
+            if len(self._label_blocks) >= self.max_label_sets:
+                self._label_blocks.clear()
+            block = '{' + ','.join(
+                f'{k}="{_escape_label(v)}"' for k, v in sorted(labels.items())
+            ) + '}'
+            self._label_blocks[key] = block
+        return block
+    
+    def _sample_line(self, sample) -> str:
+        timestamp = ''
+        if sample.timestamp is not None:
+            # Convert to milliseconds.
+            timestamp = f' {int(float(sample.timestamp) * 1000):d}'
+        return f'{sample.name}{self._label_block(sample.labels)} {floatToGoString(sample.value)}{timestamp}\n'
+    
+    def export(self) -> bytes:
+        """Render every collector in the registry."""
+        with self._lock:
+            buf = self._buf
+            buf.seek(0)
+            buf.truncate()
+            write = buf.write
+            sample_line = self._sample_line
+            
+            for metric in self.registry.collect():
+                try:
+                    header, om_names, om_headers = self._family_header(metric)
+                    write(header)
+                    om_samples: Dict[str, list] = {}
+                    for sample in metric.samples:
+                        suffix = om_names.get(sample.name)
+                        if suffix is None:
+                            write(sample_line(sample))
+                        else:
+                            # OpenMetrics specific sample, put in a gauge at the end.
+                            om_samples.setdefault(suffix, []).append(sample_line(sample))
+                except Exception as exception:
+                    exception.args = (exception.args or ('',)) + (metric,)
+                    raise
+                
+                for suffix, lines in sorted(om_samples.items()):
+                    write(om_headers[suffix])
+                    write(''.join(lines))
+            
+            return buf.getvalue().encode('utf-8')
+
 
 class MetricsCollector:
     """
@@ -26,7 +269,11 @@ class MetricsCollector:
     
     def __init__(self, registry: CollectorRegistry = None):
         self.registry = registry or CollectorRegistry()
+        self._tool_label = _LabelLimiter(settings.metrics_allowed_tools)
+        self._endpoint_label = _LabelLimiter(settings.metrics_allowed_endpoints)
         self._init_metrics()
+        self._prewarm()
+        self._exporter = _TextExporter(self.registry)
     
     def _init_metrics(self):
         """Initialize all Prometheus metrics."""
@@ -42,7 +289,7 @@ class MetricsCollector:
         self.request_duration = Histogram(
             'voicebot_request_duration_seconds',
             'Request duration in seconds',
-            ['endpoint', 'method'],
+            ['endpoint'],
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0],
             registry=self.registry
         )
@@ -63,10 +310,11 @@ class MetricsCollector:
             registry=self.registry
         )
         
-        self.llm_tokens = Summary(
+        self.llm_tokens = Histogram(
             'voicebot_llm_tokens',
             'Token usage per LLM call',
             ['model', 'token_type'],  # input, output
+            buckets=[16, 64, 256, 1024, 4096, 16384, 65536],
             registry=self.registry
         )
         
@@ -118,7 +366,7 @@ class MetricsCollector:
         self.stt_calls = Counter(
             'voicebot_stt_calls_total',
             'Speech-to-text API calls',
-            ['provider', 'language', 'status'],
+            ['provider', 'status'],
             registry=self.registry
         )
         
@@ -133,7 +381,7 @@ class MetricsCollector:
         self.tts_calls = Counter(
             'voicebot_tts_calls_total',
             'Text-to-speech API calls',
-            ['provider', 'voice', 'status'],
+            ['provider', 'status'],
             registry=self.registry
         )
         
@@ -204,12 +452,79 @@ class MetricsCollector:
             registry=self.registry
         )
         
+        # Cached label children for the track_* hot paths
+        self._request_count_child = _child_cache(self.request_count)
+        self._request_duration_child = _child_cache(self.request_duration)
+        self._llm_bundles: Dict[tuple, _LLMMetricBundle] = {}
+        self._guardrail_checks_child = _child_cache(self.guardrail_checks)
+        self._guardrail_violations_child = _child_cache(self.guardrail_violations)
+        self._tool_calls_child = _child_cache(self.tool_calls)
+        self._call_count_child = _child_cache(self.call_count)
+        self._errors_child = _child_cache(self.errors)
+        self._stt_calls_child = _child_cache(self.stt_calls)
+        self._stt_latency_child = _child_cache(self.stt_latency)
+        self._tts_calls_child = _child_cache(self.tts_calls)
+        self._tts_latency_child = _child_cache(self.tts_latency)
+        
         logger.info("metrics_initialized", metrics_count=len(self.registry._collector_to_names))
     
+    def _prewarm(self):
+        """
+        Materialize label children for every value known from settings.
+        
+        Creating a child takes the metric's lock and allocates its series;
+        doing it here keeps that off the first requests and fills the child
+        caches used by the track_* methods.
+        """
+        llm_models = (
+            (settings.ollama_model, "ollama"),
+            (settings.gemini_model, "gemini"),
+            (settings.openai_model, "openai"),
+            (settings.groq_model, "groq"),
+        )
+        for model, provider in llm_models:
+            for status in _LLM_STATUSES:
+                key = (model, provider, status)
+                self._llm_bundles[key] = _LLMMetricBundle(self, *key)
+        
+        for tool_name in settings.metrics_allowed_tools:
+            for status in _LLM_STATUSES:
+                self._tool_calls_child(self._tool_label(tool_name), status)
+        
+        for check_type, severity in _GUARDRAIL_SEVERITIES.items():
+            self._guardrail_checks_child(check_type, "pass")
+            self._guardrail_checks_child(check_type, "fail")
+            self._guardrail_violations_child(check_type, severity)
+        
+        self.prewarm_endpoints((endpoint, ("GET",)) for endpoint in settings.metrics_allowed_endpoints)
+    
+    def prewarm_endpoints(self, routes: Iterable[Tuple[str, Iterable[str]]]):
+        """
+        Materialize request metric children for known routes.
+        
+        Args:
+            routes: (route pattern, HTTP methods) pairs, e.g. from ``app.routes``
+        """
+        for endpoint, methods in routes:
+            endpoint = self._endpoint_label(_normalize_endpoint(endpoint))
+            self._request_duration_child(endpoint)
+            for method in methods:
+                self._request_count_child(endpoint, method, 200)
+    
     def track_request(self, endpoint: str, method: str, status: int, duration: float):
-        """Track HTTP request."""
-        self.request_count.labels(endpoint=endpoint, method=method, status=status).inc()
-        self.request_duration.labels(endpoint=endpoint, method=method).observe(duration)
+        """
+        Track HTTP request.
+        
+        Args:
+            endpoint: Route pattern (e.g. ``/session/{session_id}``); raw paths
+                have ID-like segments collapsed before labelling
+            method: HTTP method
+            status: Response status code
+            duration: Request duration in seconds
+        """
+        endpoint = self._endpoint_label(_normalize_endpoint(endpoint))
+        self._request_count_child(endpoint, method, status).inc()
+        self._request_duration_child(endpoint).observe(duration)
     
     def track_llm_call(
         self,
@@ -222,31 +537,80 @@ class MetricsCollector:
         status: str = "success"
     ):
         """Track LLM API call."""
-        self.llm_calls.labels(model=model, provider=provider, status=status).inc()
-        self.llm_latency.labels(model=model, provider=provider).observe(latency)
-        self.llm_tokens.labels(model=model, token_type="input").observe(input_tokens)
-        self.llm_tokens.labels(model=model, token_type="output").observe(output_tokens)
-        self.llm_cost.labels(model=model, provider=provider).inc(cost)
+        key = (model, provider, status)
+        bundle = self._llm_bundles.get(key)
+        if bundle is None:
+            bundle = self._llm_bundles[key] = _LLMMetricBundle(self, model, provider, status)
+        
+        sink = _active_batch.get() or _DIRECT
+        sink.inc(bundle.calls)
+        sink.observe(bundle.latency, latency)
+        sink.observe(bundle.tokens_in, input_tokens)
+        sink.observe(bundle.tokens_out, output_tokens)
+        sink.inc(bundle.cost, cost)
     
     def track_guardrail(self, check_type: str, result: str, violation: bool = False, severity: str = "low"):
         """Track guardrail check."""
-        self.guardrail_checks.labels(check_type=check_type, result=result).inc()
+        sink = _active_batch.get() or _DIRECT
+        sink.inc(self._guardrail_checks_child(check_type, result))
         if violation:
-            self.guardrail_violations.labels(violation_type=check_type, severity=severity).inc()
+            sink.inc(self._guardrail_violations_child(check_type, severity))
     
     def track_tool_call(self, tool_name: str, status: str = "success"):
         """Track agent tool call."""
-        self.tool_calls.labels(tool_name=tool_name, status=status).inc()
+        tool_name = self._tool_label(tool_name)
+        (_active_batch.get() or _DIRECT).inc(self._tool_calls_child(tool_name, status))
+    
+    def track_stt(self, provider: str, latency: float, status: str = "success"):
+        """Track speech-to-text call."""
+        self._stt_calls_child(provider, status).inc()
+        self._stt_latency_child(provider).observe(latency)
+    
+    def track_tts(self, provider: str, latency: float, status: str = "success"):
+        """Track text-to-speech call."""
+        self._tts_calls_child(provider, status).inc()
+        self._tts_latency_child(provider).observe(latency)
     
     def track_call(self, direction: str, status: str, duration: float = None):
         """Track phone call."""
-        self.call_count.labels(direction=direction, status=status).inc()
+        self._call_count_child(direction, status).inc()
         if duration:
             self.call_duration.observe(duration)
     
+    def track_error(self, error_type: str, component: str, severity: str = "medium"):
+        """Track application error."""
+        self._errors_child(error_type, component, severity).inc()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Buffer LLM, guardrail and tool-call updates until the block exits.
+        
+        Repeated increments of the same labeled counter collapse into one
+        ``inc(total)`` at flush. The buffer lives in a context variable, so
+        it covers the current thread or asyncio task only; nested ``batch()``
+        blocks join the outermost one.
+        
+        Example:
+            with metrics.batch():
+                for item in queue:
+                    process(item)  # track_* calls are buffered
+        """
+        if _active_batch.get() is not None:
+            yield
+            return
+        
+        batch = _MetricBatch()
+        token = _active_batch.set(batch)
+        try:
+            yield
+        finally:
+            _active_batch.reset(token)
+            batch.flush()
+    
     def export_metrics(self) -> bytes:
         """Export metrics in Prometheus format."""
-        return generate_latest(self.registry)
+        return self._exporter.export()
 
 
 # Global metrics instance
@@ -4,8 +4,10 @@ Captures full conversation traces, LLM calls, tool usage, and performance metric
 """
 from typing import Any, Dict, Optional, Callable
 from functools import wraps
+import itertools
+import logging
+import os
 import time
-import uuid
 from contextlib import contextmanager
 
 from langsmith import Client as LangSmithClient
@@ -16,6 +18,48 @@ from src.config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+# Per-call trace events go straight to the stdlib logger (fields passed via
+# ``extra=``), skipping structlog's processor chain on every LLM/tool call.
+# Error and startup events keep using structlog.
+_stdlib_logger = logging.getLogger(__name__)
+_info = _stdlib_logger.info
+
+
+def _new_id_prefix() -> str:
+    """Process-unique ID prefix (pid + load time) so workers never collide."""
+    return f"{os.getpid():x}{time.monotonic_ns() & 0xffffff:06x}"
+
+
+# Trace/span IDs are log correlation keys, not secrets: a counter avoids the
+# urandom read and hex encoding of uuid4() on every traced call.
+_ID_PREFIX = _new_id_prefix()
+_ID_COUNTER = itertools.count()
+
+
+def _reset_ids_after_fork():
+    global _ID_PREFIX, _ID_COUNTER
+    _ID_PREFIX = _new_id_prefix()
+    _ID_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_ids_after_fork)
+
+
+def _next_id(kind: str) -> str:
+    """Return a process-unique ID such as ``llm_3f2a9c01d-1b``."""
+    return f"{kind}_{_ID_PREFIX}-{next(_ID_COUNTER):x}"
+
+
+def _output_tokens(result: Dict[str, Any]) -> int:
+    """Output token count from the result's usage block, else a ~4 chars/token estimate."""
+    usage = result.get("usage")
+    if usage and "output_tokens" in usage:
+        return usage["output_tokens"]
+    if "text" in result:
+        return len(result["text"]) >> 2
+    return 0
+
 
 class TracingManager:
     """
@@ -37,7 +81,7 @@ class TracingManager:
     
     def create_trace_id(self) -> str:
         """Generate a unique trace ID."""
-        return f"trace_{uuid.uuid4().hex[:16]}"
+        return _next_id("trace")
     
     @contextmanager
     def trace_conversation(self, conversation_id: str, metadata: Optional[Dict] = None):
@@ -49,19 +93,23 @@ class TracingManager:
             metadata: Additional metadata to attach
             
         Yields:
-            Trace context
+            Trace context. ``start_time`` and metadata are only included
+            when INFO trace events are enabled.
         """
         trace_id = self.create_trace_id()
-        start_time = time.time()
-        
-        trace_data = {
-            "trace_id": trace_id,
-            "conversation_id": conversation_id,
-            "start_time": start_time,
-            **(metadata or {})
-        }
+        start_ns = time.perf_counter_ns()
+        enabled = _stdlib_logger.isEnabledFor(logging.INFO)
         
-        logger.info("trace_started", **trace_data)
+        if enabled:
+            trace_data = {
+                "trace_id": trace_id,
+                "conversation_id": conversation_id,
+                "start_time": time.time(),  # Wall-clock timestamp for the payload
+                **(metadata or {})
+            }
+            logger.info("trace_started", **trace_data)
+        else:
+            trace_data = {"trace_id": trace_id, "conversation_id": conversation_id}
         
         try:
             yield trace_data
@@ -74,81 +122,126 @@ class TracingManager:
             )
             raise
         finally:
-            duration = time.time() - start_time
-            logger.info(
-                "trace_completed",
-                trace_id=trace_id,
-                duration_seconds=duration
-            )
+            if enabled:
+                logger.info(
+                    "trace_completed",
+                    trace_id=trace_id,
+                    duration_seconds=(time.perf_counter_ns() - start_ns) / 1e9
+                )
 
 
-def trace_llm_call(
-    model: str,
-    provider: str = "ollama"
+def _llm_started_fields(args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "prompt_length": len(kwargs.get("prompt", "")),
+        "max_tokens": kwargs.get("max_tokens", settings.max_tokens_per_request),
+    }
+
+
+def _llm_completed_fields(result: Any, elapsed_ns: int) -> Dict[str, Any]:
+    return {
+        "output_tokens": _output_tokens(result),
+        "latency_ms": elapsed_ns // 1_000_000,
+    }
+
+
+def _tool_started_fields(args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # "args" is a reserved LogRecord attribute, hence call_args
+    return {
+        "call_args": str(args)[:100],  # Truncate for logging
+        "call_kwargs": str(kwargs)[:100],
+    }
+
+
+def _tool_completed_fields(result: Any, elapsed_ns: int) -> Dict[str, Any]:
+    return {"success": True}
+
+
+def _make_async_tracer(
+    event: str,
+    id_kind: str,
+    id_field: str,
+    fields: Dict[str, Any],
+    started_fields: Optional[Callable[[tuple, Dict[str, Any]], Dict[str, Any]]] = None,
+    completed_fields: Optional[Callable[[Any, int], Dict[str, Any]]] = None
 ) -> Callable:
     """
-    Decorator for tracing LLM calls with comprehensive metrics.
+    Build a decorator that logs ``<event>_started/_completed/_failed`` around an async call.
     
     Args:
-        model: Model name
-        provider: LLM provider (ollama, openai, etc.)
+        event: Event name prefix (e.g. "llm_call")
+        id_kind: Prefix for the per-call ID (e.g. "llm")
+        id_field: Field name the per-call ID is logged under
+        fields: Static fields included in every event
+        started_fields: Optional (args, kwargs) -> extra fields for the started event
+        completed_fields: Optional (result, elapsed_ns) -> extra fields for the completed event
         
     Returns:
-        Decorated function
+        Decorator for async functions
     """
+    started_event = f"{event}_started"
+    completed_event = f"{event}_completed"
+    failed_event = f"{event}_failed"
+    # Static fields are built once per tracer, not per call
+    log = logger.bind(**fields)
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            start_time = time.time()
-            trace_id = f"llm_{uuid.uuid4().hex[:12]}"
+            start_ns = time.perf_counter_ns()
+            span_id = _next_id(id_kind)
+            enabled = _stdlib_logger.isEnabledFor(logging.INFO)
             
-            # Extract prompt from kwargs
-            prompt = kwargs.get("prompt", "")
-            max_tokens = kwargs.get("max_tokens", settings.max_tokens_per_request)
-            
-            logger.info(
-                "llm_call_started",
-                trace_id=trace_id,
-                model=model,
-                provider=provider,
-                prompt_length=len(prompt),
-                max_tokens=max_tokens
-            )
+            if enabled:
+                extra = {**fields, id_field: span_id}
+                if started_fields is not None:
+                    extra.update(started_fields(args, kwargs))
+                _info(started_event, extra=extra)
             
             try:
-                # Execute LLM call
                 result = await func(*args, **kwargs)
-                
-                # Calculate metrics
-                duration = time.time() - start_time
-                output_tokens = len(result.get("text", "")) // 4  # Rough estimate
-                
-                logger.info(
-                    "llm_call_completed",
-                    trace_id=trace_id,
-                    model=model,
-                    duration_seconds=duration,
-                    output_tokens=output_tokens,
-                    latency_ms=duration * 1000
-                )
-                
-                return result
-                
             except Exception as e:
-                duration = time.time() - start_time
-                logger.error(
-                    "llm_call_failed",
-                    trace_id=trace_id,
-                    model=model,
+                log.error(
+                    failed_event,
+                    **{id_field: span_id},
                     error=str(e),
-                    duration_seconds=duration
+                    duration_seconds=(time.perf_counter_ns() - start_ns) / 1e9
                 )
                 raise
-                
+            
+            if enabled:
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                extra = {**fields, id_field: span_id, "duration_seconds": elapsed_ns / 1e9}
+                if completed_fields is not None:
+                    extra.update(completed_fields(result, elapsed_ns))
+                _info(completed_event, extra=extra)
+            
+            return result
+        
         return wrapper
     return decorator
 
 
+def trace_llm_call(
+    model: str,
+    provider: str = "ollama"
+) -> Callable:
+    """
+    Decorator for tracing LLM calls with comprehensive metrics.
+    
+    Args:
+        model: Model name
+        provider: LLM provider (ollama, openai, etc.)
+        
+    Returns:
+        Decorated function
+    """
+    return _make_async_tracer(
+        "llm_call", "llm", "trace_id",
+        {"model": model, "provider": provider},
+        _llm_started_fields, _llm_completed_fields
+    )
+
+
 def trace_agent_step(
     step_name: str,
     step_type: str = "reasoning"
@@ -163,45 +256,10 @@ def trace_agent_step(
     Returns:
         Decorated function
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            start_time = time.time()
-            step_id = f"step_{uuid.uuid4().hex[:12]}"
-            
-            logger.info(
-                "agent_step_started",
-                step_id=step_id,
-                step_name=step_name,
-                step_type=step_type
-            )
-            
-            try:
-                result = await func(*args, **kwargs)
-                duration = time.time() - start_time
-                
-                logger.info(
-                    "agent_step_completed",
-                    step_id=step_id,
-                    step_name=step_name,
-                    duration_seconds=duration
-                )
-                
-                return result
-                
-            except Exception as e:
-                duration = time.time() - start_time
-                logger.error(
-                    "agent_step_failed",
-                    step_id=step_id,
-                    step_name=step_name,
-                    error=str(e),
-                    duration_seconds=duration
-                )
-                raise
-                
-        return wrapper
-    return decorator
+    return _make_async_tracer(
+        "agent_step", "step", "step_id",
+        {"step_name": step_name, "step_type": step_type}
+    )
 
 
 def trace_tool_call(tool_name: str) -> Callable:
@@ -214,47 +272,11 @@ def trace_tool_call(tool_name: str) -> Callable:
     Returns:
         Decorated function
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            start_time = time.time()
-            tool_id = f"tool_{uuid.uuid4().hex[:12]}"
-            
-            logger.info(
-                "tool_call_started",
-                tool_id=tool_id,
-                tool_name=tool_name,
-                args=str(args)[:100],  # Truncate for logging
-                kwargs=str(kwargs)[:100]
-            )
-            
-            try:
-                result = await func(*args, **kwargs)
-                duration = time.time() - start_time
-                
-                logger.info(
-                    "tool_call_completed",
-                    tool_id=tool_id,
-                    tool_name=tool_name,
-                    duration_seconds=duration,
-                    success=True
-                )
-                
-                return result
-                
-            except Exception as e:
-                duration = time.time() - start_time
-                logger.error(
-                    "tool_call_failed",
-                    tool_id=tool_id,
-                    tool_name=tool_name,
-                    error=str(e),
-                    duration_seconds=duration
-                )
-                raise
-                
-        return wrapper
-    return decorator
+    return _make_async_tracer(
+        "tool_call", "tool", "tool_id",
+        {"tool_name": tool_name},
+        _tool_started_fields, _tool_completed_fields
+    )
 
 
 # Global tracing manager instance
@@ -4,14 +4,129 @@ Hybrid approach: In-memory cache + database persistence
 """
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from collections import deque
-from threading import Lock
+from collections import OrderedDict, deque
+from threading import Condition, Lock, Thread
+import queue
+import time
+import weakref
 import structlog
 
 from src.database import get_database_manager, Conversation
 
 logger = structlog.get_logger(__name__)
 
+_STOP = object()  # Writer-queue sentinel
+_INSERT_MESSAGE = Conversation.__table__.insert()
+
+
+class _MessageWriter:
+    """
+    Background writer that commits queued messages in batches.
+    
+    Holds no reference to the memory object, so an unused memory can be
+    garbage collected; a weakref.finalize hook then stops the writer
+    (or at interpreter exit, whichever comes first).
+    
+    Pending rows are counted per conversation, so readers only wait for
+    the conversation they are reading.
+    """
+    
+    def __init__(self, db_manager, batch_size: int):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue()
+        self._pending: Dict[str, int] = {}  # conversation_id -> unwritten rows
+        self._cond = Condition()
+        self._closed = False
+        self._thread = Thread(
+            target=self._run,
+            name="conversation-db-writer",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def submit(self, message: Dict[str, Any]):
+        """Queue a message (written through directly once the writer is closed)"""
+        with self._cond:
+            if not self._closed:
+                conversation_id = message['conversation_id']
+                self._pending[conversation_id] = self._pending.get(conversation_id, 0) + 1
+                self.queue.put(message)
+                return
+        self.write_batch([message])
+    
+    def _run(self):
+        """Drain the queue, committing up to batch_size messages per transaction"""
+        while True:
+            item = self.queue.get()
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+                # Coalesce whatever else is already queued
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+            
+            if batch:
+                self.write_batch(batch)
+                self._mark_written(batch)
+            if stop:
+                return
+    
+    def _mark_written(self, batch: List[Dict[str, Any]]):
+        """Drop written rows from the pending counts and wake waiting readers"""
+        with self._cond:
+            for message in batch:
+                conversation_id = message['conversation_id']
+                remaining = self._pending[conversation_id] - 1
+                if remaining:
+                    self._pending[conversation_id] = remaining
+                else:
+                    del self._pending[conversation_id]
+            self._cond.notify_all()
+    
+    def write_batch(self, batch: List[Dict[str, Any]]):
+        """Persist a batch of messages in one transaction (Core executemany, no ORM objects)"""
+        try:
+            with self.db_manager.get_session() as session:
+                session.execute(_INSERT_MESSAGE, batch)
+            
+            logger.debug("messages_persisted", count=len(batch))
+        except Exception as e:
+            logger.error("failed_to_persist_message",
+                        count=len(batch),
+                        error=str(e))
+            # Don't fail the request if persistence fails
+    
+    def wait(self, conversation_id: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a conversation's (or, with no id, every) queued message
+        is written. Returns False if the timeout expired first.
+        """
+        if conversation_id is None:
+            predicate = lambda: not self._pending
+        else:
+            predicate = lambda: conversation_id not in self._pending
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout)
+    
+    def close(self):
+        """Write pending messages and stop the thread"""
+        with self._cond:
+            if self._closed:
+                return
+            # Nothing is queued after the sentinel, so the thread drains everything
+            self._closed = True
+            self.queue.put(_STOP)
+        self._thread.join()
+
 
 class PersistentConversationMemory:
     """
@@ -30,7 +145,9 @@ class PersistentConversationMemory:
         max_messages: int = 10, 
         conversation_ttl_hours: int = 24,
         max_conversations: int = 1000,
-        use_database: bool = True
+        use_database: bool = True,
+        write_batch_size: int = 50,
+        flush_timeout: float = 5.0
     ):
         """
         Initialize persistent conversation memory.
@@ -40,17 +157,28 @@ class PersistentConversationMemory:
             conversation_ttl_hours: Hours before conversation expires
             max_conversations: Maximum number of concurrent conversations in memory
             use_database: Whether to persist to database (default: True)
+            write_batch_size: Max messages committed per database transaction
+            flush_timeout: Max seconds a read waits for queued writes
         """
-        self.conversations: Dict[str, Dict[str, Any]] = {}
+        # Ordered least- to most-recently updated, so eviction is popitem(last=False)
+        self.conversations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.max_messages = max_messages
         self.max_conversations = max_conversations
         self.ttl = timedelta(hours=conversation_ttl_hours)
+        self.ttl_seconds = conversation_ttl_hours * 3600
         self.use_database = use_database
         self._lock = Lock()
+        self._total_messages = 0  # Messages held in memory across all conversations
         
-        # Database manager
+        # Database manager; messages are persisted by a single background
+        # writer that commits them in batches
+        self.write_batch_size = write_batch_size
+        self.flush_timeout = flush_timeout
         if self.use_database:
             self.db_manager = get_database_manager()
+            self._writer = _MessageWriter(self.db_manager, write_batch_size)
+            # Stops the writer when this object is collected or at exit
+            self._finalizer = weakref.finalize(self, self._writer.close)
         
         logger.info("persistent_memory_initialized",
                    max_messages=max_messages,
@@ -82,6 +210,9 @@ class PersistentConversationMemory:
             duration_ms: Processing duration in milliseconds
         """
         with self._lock:
+            now = datetime.utcnow()
+            now_monotonic = time.monotonic()
+            
             # Enforce conversation limit in memory
             if conversation_id not in self.conversations:
                 while len(self.conversations) >= self.max_conversations:
@@ -89,23 +220,26 @@ class PersistentConversationMemory:
                 
                 self.conversations[conversation_id] = {
                     'messages': deque(maxlen=self.max_messages),
-                    'created_at': datetime.utcnow(),
-                    'last_updated': datetime.utcnow(),
+                    'created_at': now,
+                    'last_updated': now_monotonic,  # monotonic seconds, for TTL
                     'message_count': 0
                 }
             
             conv = self.conversations[conversation_id]
+            self.conversations.move_to_end(conversation_id)
             message_index = conv['message_count']
             
-            # Add to in-memory cache
+            # Add to in-memory cache (a full deque drops its oldest message)
+            if len(conv['messages']) < self.max_messages:
+                self._total_messages += 1
             conv['messages'].append({
                 'role': role,
                 'content': content,
-                'timestamp': datetime.utcnow(),
+                'timestamp': now,
                 'message_index': message_index
             })
             
-            conv['last_updated'] = datetime.utcnow()
+            conv['last_updated'] = now_monotonic
             conv['message_count'] += 1
             
             logger.debug("message_added_memory",
@@ -113,7 +247,7 @@ class PersistentConversationMemory:
                         role=role,
                         message_index=message_index)
         
-        # Persist to database (outside lock for performance)
+        # Queue for the background writer (outside lock for performance)
         if self.use_database:
             self._persist_message(
                 conversation_id=conversation_id,
@@ -137,29 +271,39 @@ class PersistentConversationMemory:
         tokens_output: int,
         duration_ms: float
     ):
-        """Persist message to database"""
-        try:
-            with self.db_manager.get_session() as session:
-                message = Conversation(
-                    conversation_id=conversation_id,
-                    role=role,
-                    content=content,
-                    user_id=user_id,
-                    message_index=message_index,
-                    tokens_input=tokens_input,
-                    tokens_output=tokens_output,
-                    duration_ms=duration_ms
-                )
-                session.add(message)
-                
-            logger.debug("message_persisted",
-                        conversation_id=conversation_id,
-                        message_index=message_index)
-        except Exception as e:
-            logger.error("failed_to_persist_message",
-                        conversation_id=conversation_id,
-                        error=str(e))
-            # Don't fail the request if persistence fails
+        """Queue message for the background writer"""
+        message = {
+            'conversation_id': conversation_id,
+            'role': role,
+            'content': content,
+            'user_id': user_id,
+            'message_index': message_index,
+            'tokens_input': tokens_input,
+            'tokens_output': tokens_output,
+            'duration_ms': duration_ms
+        }
+        self._writer.submit(message)
+    
+    def flush(self, conversation_id: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued messages to be written.
+        
+        Args:
+            conversation_id: Only wait for this conversation's messages
+                             (default: every queued message)
+            timeout: Max seconds to wait (default: wait indefinitely)
+        
+        Returns:
+            False if the timeout expired with messages still queued
+        """
+        if not self.use_database:
+            return True
+        return self._writer.wait(conversation_id, timeout)
+    
+    def close(self):
+        """Flush pending writes and stop the background writer"""
+        if self.use_database:
+            self._finalizer()
     
     def get_history(
         self, 
@@ -179,27 +323,30 @@ class PersistentConversationMemory:
             List of messages in format [{'role': 'user', 'content': '...'}, ...]
         """
         if from_database and self.use_database:
+            self.flush(conversation_id, self.flush_timeout)
             return self._load_from_database(conversation_id, max_messages)
         
-        with self._lock:
-            if conversation_id not in self.conversations:
-                # Try loading from database
-                if self.use_database:
-                    return self._load_from_database(conversation_id, max_messages)
-                return []
-            
-            conv = self.conversations[conversation_id]
-            messages = list(conv['messages'])
-            
-            # Limit if requested
-            if max_messages:
-                messages = messages[-max_messages:]
-            
-            # Format for LLM (remove timestamps and index)
-            return [
-                {'role': msg['role'], 'content': msg['content']}
-                for msg in messages
-            ]
+        # Lock-free read: dict.get and list(deque) each run in C without
+        # releasing the GIL, so this is an atomic snapshot of the messages
+        conv = self.conversations.get(conversation_id)
+        if conv is None:
+            # Try loading from database
+            if self.use_database:
+                self.flush(conversation_id, self.flush_timeout)
+                return self._load_from_database(conversation_id, max_messages)
+            return []
+        
+        messages = list(conv['messages'])
+        
+        # Limit if requested
+        if max_messages:
+            messages = messages[-max_messages:]
+        
+        # Format for LLM (remove timestamps and index)
+        return [
+            {'role': msg['role'], 'content': msg['content']}
+            for msg in messages
+        ]
     
     def _load_from_database(
         self, 
@@ -209,17 +356,17 @@ class PersistentConversationMemory:
         """Load conversation history from database"""
         try:
             with self.db_manager.get_session() as session:
-                query = session.query(Conversation)\
-                    .filter(Conversation.conversation_id == conversation_id)\
-                    .order_by(Conversation.message_index)
+                query = session.query(Conversation.role, Conversation.content)\
+                    .filter(Conversation.conversation_id == conversation_id)
                 
                 if max_messages:
-                    # Get last N messages
-                    total = query.count()
-                    if total > max_messages:
-                        query = query.offset(total - max_messages)
-                
-                messages = query.all()
+                    # Last N messages: indexed range scan from the tail
+                    messages = query.order_by(Conversation.message_index.desc())\
+                        .limit(max_messages)\
+                        .all()
+                    messages.reverse()
+                else:
+                    messages = query.order_by(Conversation.message_index).all()
                 
                 logger.debug("loaded_from_database",
                             conversation_id=conversation_id,
@@ -237,29 +384,43 @@ class PersistentConversationMemory:
     
     def get_context(self, conversation_id: str, max_messages: int = 5) -> str:
         """Get formatted conversation context for LLM prompt (thread-safe)"""
+        # In-memory conversations cache their formatted context until the next
+        # message. The count is read before the history snapshot, so a racing
+        # add_message can only cause a miss, never a stale hit.
+        conv = self.conversations.get(conversation_id)
+        if conv is not None:
+            key = (conv['message_count'], max_messages)
+            cached = conv.get('context_cache')
+            if cached is not None and cached[0] == key:
+                return cached[1]
+        
         history = self.get_history(conversation_id, max_messages)
         
         if not history:
             return ""
         
         # Format as conversation
-        context_lines = []
-        for msg in history:
-            role = "User" if msg['role'] == 'user' else "Assistant"
-            context_lines.append(f"{role}: {msg['content']}")
+        context = "\n".join([
+            f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+            for msg in history
+        ])
         
-        return "\n".join(context_lines)
+        if conv is not None:
+            conv['context_cache'] = (key, context)
+        return context
     
     def clear_conversation(self, conversation_id: str, from_database: bool = False):
         """Clear a specific conversation (thread-safe)"""
         with self._lock:
             if conversation_id in self.conversations:
-                del self.conversations[conversation_id]
+                conv = self.conversations.pop(conversation_id)
+                self._total_messages -= len(conv['messages'])
                 logger.info("conversation_cleared_memory", 
                            conversation_id=conversation_id)
         
         # Also clear from database if requested
         if from_database and self.use_database:
+            self.flush(conversation_id, self.flush_timeout)
             try:
                 with self.db_manager.get_session() as session:
                     count = session.query(Conversation)\
@@ -274,44 +435,39 @@ class PersistentConversationMemory:
                             error=str(e))
     
     def _evict_oldest_conversation_unsafe(self):
-        """Evict oldest conversation from memory (MUST be called within lock!)"""
+        """Evict least recently updated conversation from memory (MUST be called within lock!)"""
         if not self.conversations:
             return
         
-        oldest_id = min(
-            self.conversations.keys(),
-            key=lambda k: self.conversations[k]['created_at']
-        )
-        del self.conversations[oldest_id]
+        oldest_id, conv = self.conversations.popitem(last=False)
+        self._total_messages -= len(conv['messages'])
         logger.debug("conversation_evicted_memory", conversation_id=oldest_id)
     
     def cleanup_expired(self):
         """Remove expired conversations from memory (thread-safe)"""
         with self._lock:
-            now = datetime.utcnow()
-            expired_ids = []
+            cutoff = time.monotonic() - self.ttl_seconds
+            expired = 0
             
-            for conv_id, conv_data in self.conversations.items():
-                if now - conv_data['last_updated'] > self.ttl:
-                    expired_ids.append(conv_id)
+            # Conversations are ordered by last update, so everything after
+            # the first live one is live too
+            while self.conversations:
+                conv = next(iter(self.conversations.values()))
+                if conv['last_updated'] >= cutoff:
+                    break
+                self.conversations.popitem(last=False)
+                self._total_messages -= len(conv['messages'])
+                expired += 1
             
-            for conv_id in expired_ids:
-                del self.conversations[conv_id]
-            
-            if expired_ids:
-                logger.info("conversations_expired_memory", count=len(expired_ids))
+            if expired:
+                logger.info("conversations_expired_memory", count=expired)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get memory statistics (thread-safe)"""
         with self._lock:
-            total_messages = sum(
-                len(conv['messages'])
-                for conv in self.conversations.values()
-            )
-            
             stats = {
                 "active_conversations_memory": len(self.conversations),
-                "total_messages_memory": total_messages,
+                "total_messages_memory": self._total_messages,
                 "max_messages_per_conversation": self.max_messages,
                 "max_conversations": self.max_conversations,
                 "ttl_hours": self.ttl.total_seconds() / 3600,
@@ -321,6 +477,8 @@ class PersistentConversationMemory:
         
         # Add database stats if available
         if self.use_database:
+            # Counts may trail the queue slightly under heavy write load
+            self.flush(timeout=self.flush_timeout)
             try:
                 with self.db_manager.get_session() as session:
                     total_db_conversations = session.query(Conversation.conversation_id)\
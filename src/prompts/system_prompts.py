@@ -2,6 +2,7 @@
 Customer Support System Prompts for VoiceBot
 Professional, polite, and formal responses for customer service
 """
+import re
 
 # Base system prompts for different contexts - Childcare Center Customer Support
 SYSTEM_PROMPTS = {
@@ -85,6 +86,39 @@ Always answer the question that was asked."""
 }
 
 
+# System prompts with their trailing separator, built once for build_enhanced_prompt
+_PROMPT_HEADERS = {key: prompt + "\n" for key, prompt in SYSTEM_PROMPTS.items()}
+
+# Context keywords, each class compiled into one alternation so a message is
+# scanned once per class in C instead of once per keyword
+_GREETING_KEYWORDS = (
+    'hi', 'hello', 'hey', 'good morning', 'good afternoon',
+    'good evening', 'greetings', 'i need help', 'i am',
+    'this is', 'my name is'
+)
+
+_ISSUE_KEYWORDS = (
+    'problem', 'issue', 'not working', 'error', 'broken',
+    'can\'t', 'cannot', 'won\'t', 'doesn\'t work', 'help',
+    'stuck', 'failed', 'unable'
+)
+
+_QUESTION_KEYWORDS = (
+    'how', 'what', 'when', 'where', 'why', 'which',
+    'can you', 'could you', 'would you', 'tell me',
+    'explain', 'show me'
+)
+
+
+def _keyword_pattern(keywords) -> "re.Pattern[str]":
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+_GREETING_RE = _keyword_pattern(_GREETING_KEYWORDS)
+_ISSUE_RE = _keyword_pattern(_ISSUE_KEYWORDS)
+_QUESTION_RE = _keyword_pattern(_QUESTION_KEYWORDS)
+
+
 def detect_context(message: str) -> str:
     """
     Detect the conversation context from user message.
@@ -93,33 +127,16 @@ def detect_context(message: str) -> str:
     """
     message_lower = message.lower()
     
-    # Greeting context
-    greeting_keywords = [
-        'hi', 'hello', 'hey', 'good morning', 'good afternoon',
-        'good evening', 'greetings', 'i need help', 'i am',
-        'this is', 'my name is'
-    ]
-    
     # Check if it's a greeting (first message likely)
-    if any(message_lower.startswith(keyword) for keyword in greeting_keywords):
+    if _GREETING_RE.match(message_lower):
         return "customer_greeting"
     
     # Issue/problem context
-    issue_keywords = [
-        'problem', 'issue', 'not working', 'error', 'broken',
-        'can\'t', 'cannot', 'won\'t', 'doesn\'t work', 'help',
-        'stuck', 'failed', 'unable'
-    ]
-    
-    if any(keyword in message_lower for keyword in issue_keywords):
+    if _ISSUE_RE.search(message_lower):
         return "issue_resolution"
     
     # General inquiry
-    question_keywords = ['how', 'what', 'when', 'where', 'why', 'which',
-                        'can you', 'could you', 'would you', 'tell me',
-                        'explain', 'show me']
-    
-    if any(keyword in message_lower for keyword in question_keywords):
+    if _QUESTION_RE.search(message_lower):
         return "general_inquiry"
     
     # Default professional support
@@ -148,25 +165,21 @@ def build_enhanced_prompt(
     if context_type is None:
         context_type = detect_context(user_message)
     
-    # Get appropriate system prompt
-    system_prompt = SYSTEM_PROMPTS.get(context_type, SYSTEM_PROMPTS["default"])
-    
-    # Build complete prompt
-    prompt_parts = [system_prompt]
+    # Static system prompt header, then only the variable fragments
+    prompt_parts = [_PROMPT_HEADERS.get(context_type, _PROMPT_HEADERS["default"])]
     
     # Add RAG context if available
     if rag_context:
-        prompt_parts.append(f"\nRelevant Information:\n{rag_context}")
+        prompt_parts += ("\nRelevant Information:\n", rag_context, "\n")
     
     # Add conversation history if available
     if conversation_context:
-        prompt_parts.append(f"\nPrevious Conversation:\n{conversation_context}")
+        prompt_parts += ("\nPrevious Conversation:\n", conversation_context, "\n")
     
     # Add user message
-    prompt_parts.append(f"\nUser: {user_message}")
-    prompt_parts.append("\nAssistant:")
+    prompt_parts += ("\nUser: ", user_message, "\n\nAssistant:")
     
-    return "\n".join(prompt_parts)
+    return "".join(prompt_parts)
 
 
 # Quick reference for voice-friendly response formatting
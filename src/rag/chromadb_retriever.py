@@ -6,9 +6,13 @@ import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any
+from collections import OrderedDict
+from threading import Lock
 import structlog
 from pathlib import Path
 
+from src.config.settings import settings as app_settings
+
 logger = structlog.get_logger(__name__)
 
 
@@ -22,7 +26,7 @@ class ChromaDBRetriever:
     - Total: ~60-150ms
     """
     
-    def __init__(self, persist_directory: str = "./data/vectordb"):
+    def __init__(self, persist_directory: str = "./data/vectordb", query_cache_size: int = 256):
         """Initialize ChromaDB and embedding model"""
         
         # Create directory if it doesn't exist
@@ -38,8 +42,23 @@ class ChromaDBRetriever:
         )
         
         # Initialize embedding model (384 dimensions, fast!)
-        logger.info("loading_embedding_model", model="all-MiniLM-L6-v2")
-        self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+        logger.info("loading_embedding_model",
+                   model="all-MiniLM-L6-v2",
+                   device=app_settings.embed_device or "auto")
+        self.embedder = SentenceTransformer('all-MiniLM-L6-v2', device=app_settings.embed_device)
+        # float32 ndarrays go to ChromaDB as-is (no .tolist() round-trip);
+        # unit-normalized vectors suit the cosine space
+        self._encode_kwargs = dict(
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+            batch_size=app_settings.embed_batch_size
+        )
+        
+        # LRU of recent query embeddings: repeated questions skip the encode
+        self._query_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._query_cache_size = query_cache_size
+        self._query_cache_lock = Lock()
         
         doc_count = self.collection.count()
         logger.info("chromadb_initialized", 
@@ -103,7 +122,7 @@ class ChromaDBRetriever:
         
         # Generate embeddings
         logger.info("generating_embeddings", count=len(documents))
-        embeddings = self.embedder.encode(documents).tolist()
+        embeddings = self.embedder.encode(documents, **self._encode_kwargs)
         
         # Generate IDs
         existing_count = self.collection.count()
@@ -134,7 +153,7 @@ class ChromaDBRetriever:
             List of results with text, score, and metadata
         """
         # Encode query
-        query_embedding = self.embedder.encode([query]).tolist()
+        query_embedding = self._encode_query(query)
         
         # Search
         results = self.collection.query(
@@ -162,6 +181,24 @@ class ChromaDBRetriever:
         
         return formatted
     
+    def _encode_query(self, query: str):
+        """Return the query embedding, reusing a cached one for repeated queries"""
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(query)
+            if embedding is not None:
+                self._query_cache.move_to_end(query)
+                return embedding
+        
+        # Encode outside the lock; a concurrent miss just encodes twice
+        embedding = self.embedder.encode([query], **self._encode_kwargs)
+        embedding.setflags(write=False)
+        
+        with self._query_cache_lock:
+            self._query_cache[query] = embedding
+            if len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        return embedding
+    
     def clear(self):
         """Clear all documents"""
         self.client.delete_collection("knowledge_base")
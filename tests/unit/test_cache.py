@@ -81,6 +81,19 @@ class TestCacheEviction:
         assert cache.get("second") is not None
         assert cache.get("third") is not None
 
+    def test_get_refreshes_recency(self):
+        """Test that a cache hit protects an entry from eviction"""
+        cache = ResponseCache(ttl_minutes=60, max_size=2)
+
+        cache.set("first", {"data": "1"})
+        cache.set("second", {"data": "2"})
+        cache.get("first")  # "second" is now least recently used
+        cache.set("third", {"data": "3"})
+
+        assert cache.get("first") is not None
+        assert cache.get("second") is None
+        assert cache.get("third") is not None
+
 
 @pytest.mark.unit
 class TestCacheTTL:
@@ -202,3 +215,21 @@ class TestCacheOperations:
         
         assert result1["data"] == "v1"
         assert result2["data"] == "v2"
+    
+    def test_context_keys_do_not_collide(self, test_cache):
+        """Separator characters or value types must not let contexts share a key"""
+        test_cache.set("m", {"data": "two fields"}, context={"a": "x", "b": "y"})
+        assert test_cache.get("m", context={"a": "x\x1fb=y"}) is None
+        assert test_cache.get("m", context={"a": "x", "b": "y"})["data"] == "two fields"
+        
+        test_cache.set("m", {"data": "int"}, context={"t": 1})
+        assert test_cache.get("m", context={"t": "1"}) is None
+        
+        test_cache.set("m", {"data": "query only"})
+        assert test_cache.get("m\x1fa=x") is None
+    
+    def test_nested_context_order_independent(self, test_cache):
+        """Nested dicts hash canonically, whatever their insertion order"""
+        test_cache.set("q", {"data": "v"}, context={"prefs": {"a": 1, "b": 2}})
+        
+        assert test_cache.get("q", context={"prefs": {"b": 2, "a": 1}})["data"] == "v"
@@ -0,0 +1,101 @@
+"""
+Unit tests for PersistentConversationMemory
+Testing the background database writer against SQLite
+"""
+import pytest
+import threading
+
+from src.database import Conversation
+from src.database.connection import DatabaseManager
+from src.persistence import conversation_db
+from src.persistence.conversation_db import PersistentConversationMemory
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    """Fresh SQLite database used by the memory under test"""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'conversations.db'}")
+    monkeypatch.setattr(conversation_db, "get_database_manager", lambda: manager)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def memory(db_manager):
+    memory = PersistentConversationMemory()
+    yield memory
+    memory.close()
+
+
+@pytest.fixture
+def gate(memory):
+    """Hold the writer thread before each batch until the gate is set"""
+    event = threading.Event()
+    writer = memory._writer
+    write_batch = writer.write_batch
+    
+    def gated_write_batch(batch):
+        event.wait(5)
+        write_batch(batch)
+    
+    writer.write_batch = gated_write_batch
+    yield event
+    event.set()
+
+
+def _row_count(db_manager, conversation_id: str) -> int:
+    with db_manager.get_session() as session:
+        return session.query(Conversation)\
+            .filter(Conversation.conversation_id == conversation_id)\
+            .count()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestConversationWriter:
+    """Background writer tests"""
+    
+    def test_database_read_waits_for_queued_rows(self, memory, db_manager, gate):
+        """A database read sees messages the writer has not committed yet"""
+        memory.add_message("conv_1", "user", "hello")
+        memory.add_message("conv_1", "assistant", "hi there")
+        assert _row_count(db_manager, "conv_1") == 0
+        
+        threading.Timer(0.05, gate.set).start()
+        history = memory.get_history("conv_1", from_database=True)
+        
+        assert history == [
+            {"role": "user", "content": "hello"},
+            {"role": "assistant", "content": "hi there"}
+        ]
+    
+    def test_flush_times_out(self, memory, gate):
+        """flush returns False while rows are still queued past the timeout"""
+        memory.add_message("conv_1", "user", "hello")
+        
+        assert memory.flush("conv_1", timeout=0.05) is False
+        assert memory.flush(timeout=0.05) is False
+        # Other conversations have nothing pending
+        assert memory.flush("conv_2", timeout=0.05) is True
+        
+        gate.set()
+        assert memory.flush(timeout=5) is True
+    
+    def test_close_drains_queue(self, memory, db_manager, gate):
+        """close writes every queued message before the writer stops"""
+        for i in range(10):
+            memory.add_message("conv_1", "user", f"message {i}")
+        
+        threading.Timer(0.05, gate.set).start()
+        memory.close()
+        
+        assert _row_count(db_manager, "conv_1") == 10
+        assert not memory._writer._thread.is_alive()
+    
+    def test_submit_after_close_writes_through(self, memory, db_manager):
+        """Messages added after close are written synchronously"""
+        memory.close()
+        memory.add_message("conv_1", "user", "late message")
+        
+        assert _row_count(db_manager, "conv_1") == 1
+        assert memory.flush("conv_1", timeout=0) is True
@@ -0,0 +1,33 @@
+"""
+Unit tests for ConversationMemory
+Testing shard sizing and eviction
+"""
+import pytest
+
+from src.memory.conversation import ConversationMemory
+
+
+@pytest.mark.unit
+class TestConversationShards:
+    """Test lock-shard sizing"""
+    
+    def test_shards_clamped_to_max_conversations(self):
+        """More shards than conversations must not create zero-capacity shards"""
+        memory = ConversationMemory(max_conversations=4, num_shards=16)
+        
+        assert len(memory._shards) == 4
+        assert all(shard.max_conversations >= 1 for shard in memory._shards)
+        
+        # Would loop forever on a zero-capacity shard
+        for i in range(20):
+            memory.add_message(f"conv_{i}", "user", "hello")
+        
+        assert memory.get_stats()["active_conversations"] <= 4
+    
+    def test_zero_max_conversations_keeps_one_shard(self):
+        """A zero limit still yields a usable shard"""
+        memory = ConversationMemory(max_conversations=0, num_shards=8)
+        
+        assert len(memory._shards) == 1
+        memory.add_message("conv_1", "user", "hello")
+        assert memory.get_stats()["active_conversations"] == 1
@@ -0,0 +1,64 @@
+"""
+Unit tests for KPIDashboard
+Testing bucket merging across threads and stream retention
+"""
+import pytest
+import threading
+import time
+from datetime import timedelta
+
+from src.observability import kpi_dashboard
+from src.observability.kpi_dashboard import KPIDashboard
+
+
+def _record_in_thread(dashboard, metrics):
+    """Record metrics from a short-lived thread"""
+    thread = threading.Thread(target=dashboard.record_conversation_metrics, args=(metrics,))
+    thread.start()
+    thread.join()
+
+
+@pytest.mark.unit
+class TestKPIDashboard:
+    """KPI aggregation tests"""
+    
+    def test_buckets_merged_across_threads(self):
+        """Each thread's stream contributes to the same report"""
+        dashboard = KPIDashboard()
+        _record_in_thread(dashboard, {"latency": 0.1, "tokens": 10, "conversation_id": "a", "success": True})
+        _record_in_thread(dashboard, {"latency": 0.3, "tokens": 30, "conversation_id": "b", "success": False})
+        dashboard.record_conversation_metrics({"latency": 0.2, "tokens": 20, "conversation_id": "a"})
+        
+        kpis = dashboard.get_performance_kpis()
+        
+        assert kpis["performance"]["total_requests"] == 3
+        assert kpis["performance"]["avg_latency_ms"] == pytest.approx(200.0)
+        assert kpis["usage"]["total_tokens"] == 60
+        assert kpis["usage"]["total_conversations"] == 2
+        assert kpis["reliability"]["success_rate"] == 0.5
+    
+    def test_short_window_keeps_exited_thread_data(self, monkeypatch):
+        """A narrow report must not discard data still inside retention"""
+        dashboard = KPIDashboard()
+        now = time.time()
+        
+        # Recorded 10 minutes ago by a thread that has since exited
+        monkeypatch.setattr(kpi_dashboard.time, "time", lambda: now - 600)
+        _record_in_thread(dashboard, {"latency": 0.1})
+        monkeypatch.setattr(kpi_dashboard.time, "time", lambda: now)
+        
+        assert dashboard.get_performance_kpis()["performance"]["total_requests"] == 1
+        assert "error" in dashboard.get_performance_kpis(timedelta(minutes=5))
+        assert dashboard.get_performance_kpis()["performance"]["total_requests"] == 1
+    
+    def test_exited_thread_dropped_after_retention(self, monkeypatch):
+        """Streams of exited threads are released once their data ages out"""
+        dashboard = KPIDashboard(retention=timedelta(hours=1))
+        now = time.time()
+        
+        monkeypatch.setattr(kpi_dashboard.time, "time", lambda: now - 7200)
+        _record_in_thread(dashboard, {"latency": 0.1})
+        monkeypatch.setattr(kpi_dashboard.time, "time", lambda: now)
+        
+        assert "error" in dashboard.get_performance_kpis()
+        assert dashboard._streams == []
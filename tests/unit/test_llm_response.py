@@ -0,0 +1,35 @@
+"""
+Unit tests for LLMResponse
+"""
+import pytest
+
+from src.llm.base import LLMResponse
+
+
+@pytest.mark.unit
+class TestLLMResponse:
+    """LLMResponse dataclass tests"""
+    
+    def test_uses_slots(self):
+        """Responses are slotted, no per-instance __dict__"""
+        response = LLMResponse(text="hi", provider="ollama", model="tinyllama")
+        
+        assert hasattr(response, "__dict__") is False
+    
+    def test_tokens_per_second(self):
+        """Rate is output tokens per second of latency"""
+        response = LLMResponse(
+            text="hi",
+            provider="ollama",
+            model="tinyllama",
+            latency_ms=500.0,
+            output_tokens=10
+        )
+        
+        assert response.tokens_per_second == pytest.approx(20.0)
+    
+    def test_tokens_per_second_zero_latency(self):
+        """Zero latency gives a zero rate instead of dividing by zero"""
+        response = LLMResponse(text="hi", provider="ollama", model="tinyllama")
+        
+        assert response.tokens_per_second == 0.0
@@ -0,0 +1,93 @@
+"""
+Unit tests for metrics export
+Testing that the cached text exporter matches prometheus_client
+"""
+import pytest
+from prometheus_client import (
+    CollectorRegistry,
+    Enum,
+    Gauge,
+    Info,
+    Summary,
+    generate_latest
+)
+from prometheus_client.core import GaugeHistogramMetricFamily, GaugeMetricFamily
+
+from src.observability.metrics import MetricsCollector
+
+
+class _TimestampedCollector:
+    """Custom collector yielding samples with timestamps and a gauge histogram"""
+    
+    def collect(self):
+        gauge = GaugeMetricFamily("voicebot_test_queue_depth", "Queue depth", labels=["queue"])
+        gauge.add_metric(["writer"], 3, timestamp=1700000000.5)
+        yield gauge
+        
+        gauge_histogram = GaugeHistogramMetricFamily(
+            "voicebot_test_inflight_bytes",
+            "In-flight bytes",
+            buckets=[("1.0", 2), ("+Inf", 5)],
+            gsum_value=7
+        )
+        yield gauge_histogram
+
+
+@pytest.fixture
+def collector():
+    """MetricsCollector on a private registry with extra metric types"""
+    registry = CollectorRegistry()
+    metrics = MetricsCollector(registry=registry)
+    
+    info = Info("voicebot_test_build", "Build information", registry=registry)
+    info.info({"version": "1.2.3", "commit": 'a"b\\c'})
+    
+    state = Enum(
+        "voicebot_test_state", "Service state",
+        states=["starting", "running", "stopped"],
+        registry=registry
+    )
+    state.state("running")
+    
+    gauge = Gauge("voicebot_test_ratio", "Ratio with\nnewline and \\ backslash", ["kind"], registry=registry)
+    gauge.labels(kind="nan").set(float("nan"))
+    gauge.labels(kind="inf").set(float("inf"))
+    gauge.labels(kind="small").set(1e-9)
+    
+    summary = Summary("voicebot_test_payload_bytes", "Payload size", registry=registry)
+    summary.observe(512)
+    
+    registry.register(_TimestampedCollector())
+    return metrics
+
+
+def _record(metrics: MetricsCollector):
+    """Touch counters, histograms and escaped label values"""
+    metrics.track_request("/api/v1/conversation", "POST", 200, 0.12)
+    metrics.track_request("/session/123", "GET", 404, 0.003)
+    metrics.track_llm_call("llama3", "ollama", 0.8, 120, 40, 0.0)
+    metrics.track_guardrail("toxicity", "fail", violation=True, severity="medium")
+    metrics.track_stt("deepgram", 0.2)
+    metrics.track_tts("elevenlabs", 0.4, status="error")
+    metrics.track_error('bad "quote"', "path\\with\\backslash", severity="line\nbreak")
+
+
+@pytest.mark.unit
+class TestMetricsExport:
+    """The cached exporter must stay byte-identical to generate_latest"""
+    
+    def test_export_matches_generate_latest(self, collector):
+        """Counter, histogram, info, enum, summary and escaped labels"""
+        _record(collector)
+        
+        assert collector.export_metrics() == generate_latest(collector.registry)
+    
+    def test_export_matches_after_updates(self, collector):
+        """Cached headers and label blocks stay correct across scrapes"""
+        _record(collector)
+        collector.export_metrics()
+        
+        _record(collector)
+        collector.track_error("timeout", "llm")
+        
+        assert collector.export_metrics() == generate_latest(collector.registry)